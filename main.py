@@ -52,6 +52,10 @@ def main():
     app.setApplicationName(app_name)
     app.setOrganizationName(app_name)
     
+    # 应用全局样式表，只需解析一次
+    from src.ui.widgets.log_widget import LOG_WIDGET_QSS
+    app.setStyleSheet(LOG_WIDGET_QSS)
+    
     # 在用户目录下创建应用程序文件夹
     app_dir_name = app.applicationName()
     user_dir = os.path.expanduser("~")
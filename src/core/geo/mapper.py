@@ -40,6 +40,8 @@ class CountryMapper:
             
         # 初始化映射表
         self._mapping_cache = self._init_country_mapping()
+        # 原始国家代码 -> 中文名称的查询缓存，只保存能找到映射的结果
+        self._name_cache: Dict[Any, str] = {}
     
     def _init_country_mapping(self) -> Dict[str, str]:
         """初始化国家/地区映射表
@@ -128,7 +130,7 @@ class CountryMapper:
         return None
         
     def get_country_name(self, country_code: str) -> Optional[str]:
-        """根据ISO代码获取国家/地区名称
+        """根据ISO代码获取国家/地区名称（结果会被缓存，映射表不会变化）
         
         Args:
             country_code: ISO代码
@@ -138,16 +140,21 @@ class CountryMapper:
         """
         if not country_code:
             return None
+        
+        cached = self._name_cache.get(country_code)
+        if cached is not None:
+            return cached
             
         # 标准化输入
-        country_code = str(country_code).strip().upper()
+        normalized = str(country_code).strip().upper()
         
         # 查找映射
-        if country_code in CODE_TO_CHINESE_NAME:
-            return CODE_TO_CHINESE_NAME[country_code]
+        if normalized in CODE_TO_CHINESE_NAME:
+            name = self._name_cache[country_code] = CODE_TO_CHINESE_NAME[normalized]
+            return name
             
         # 未找到映射
-        logger.debug(f"未找到国家代码的映射: {country_code}")
+        logger.debug(f"未找到国家代码的映射: {normalized}")
         return None
     
     def get_country_english_name(self, country_code: str) -> Optional[str]:
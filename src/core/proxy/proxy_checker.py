@@ -8,6 +8,7 @@ from typing import Dict, Any, Tuple, Optional, List, Callable, Set
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.utils.logger import get_logger
 from src.utils.config_manager import ConfigManager
+from src.utils.async_runner import get_async_runner
 import threading
 from requests.exceptions import RequestException, Timeout, ProxyError
 from src.core.geo.country_mapper import get_mapper
@@ -261,6 +262,9 @@ class ProxyChecker:
         self.ip_detector = None  # IP地区检测器
         self.country_mapper = get_mapper()
         
+        # 常驻事件循环（AsyncRunner）上复用的ClientSession，其他事件循环每次检测单独创建会话
+        self._runner_session: Optional[aiohttp.ClientSession] = None
+        
         # 加载配置
         self._load_config()
     
@@ -329,6 +333,10 @@ class ProxyChecker:
         # 初始化URL状态跟踪
         self._initialize_url_tracking()
     
+    def reload_config(self):
+        """重新加载配置"""
+        self._load_config()
+    
     def _initialize_url_tracking(self):
         """初始化URL状态跟踪"""
         with self.lock:
@@ -404,6 +412,25 @@ class ProxyChecker:
             
             logger.warning(f"测试URL被标记为暂时不可用 (状态码: {status_code}): {url}，冷却时间: {cooldown_time}秒")
     
+    def _get_runner_session(self) -> aiohttp.ClientSession:
+        """获取常驻事件循环上复用的ClientSession，不存在或已关闭时创建
+        
+        只能在 AsyncRunner 的事件循环中调用，该循环是单线程的，无需加锁
+        
+        Returns:
+            aiohttp.ClientSession: 常驻事件循环上的会话
+        """
+        session = self._runner_session
+        if session is None or session.closed:
+            session = self._runner_session = aiohttp.ClientSession()
+        return session
+    
+    async def close_session(self) -> None:
+        """关闭常驻事件循环上复用的ClientSession，需要在 AsyncRunner 的事件循环中执行"""
+        session, self._runner_session = self._runner_session, None
+        if session is not None and not session.closed:
+            await session.close()
+    
     def format_proxy_url(self, proxy: Dict[str, Any]) -> Optional[str]:
         """格式化代理URL
         
@@ -502,12 +529,44 @@ class ProxyChecker:
             if loop:
                 loop.close()
     
-    async def _check_connection_async(self, test_url: Optional[str] = None, proxy_url: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
+    async def _check_connection_async(self, test_url: Optional[str] = None, proxy_url: Optional[str] = None,
+                                      connect_timeout: Optional[float] = None,
+                                      total_timeout: Optional[float] = None) -> Tuple[bool, Dict[str, Any]]:
         """内部通用的连接检测方法，被代理检测和直连检测共用
         
+        在常驻事件循环（AsyncRunner）中复用同一个ClientSession；在调用方
+        自己的事件循环中每次检测使用独立的会话，检测结束即关闭。
+        
+        Args:
+            test_url: 测试URL，如果为None则自动选择
+            proxy_url: 代理URL，如果为None则表示直连
+            connect_timeout: TCP连接超时时间（秒），为None时不单独限制
+            total_timeout: 单次请求的总超时时间（秒），为None时使用配置的timeout
+            
+        Returns:
+            Tuple[bool, Dict]: (是否成功, 结果详情)
+        """
+        if get_async_runner().in_loop():
+            return await self._check_connection_with_session(
+                self._get_runner_session(), test_url, proxy_url, connect_timeout, total_timeout
+            )
+        async with aiohttp.ClientSession() as session:
+            return await self._check_connection_with_session(
+                session, test_url, proxy_url, connect_timeout, total_timeout
+            )
+    
+    async def _check_connection_with_session(self, session: aiohttp.ClientSession,
+                                             test_url: Optional[str] = None, proxy_url: Optional[str] = None,
+                                             connect_timeout: Optional[float] = None,
+                                             total_timeout: Optional[float] = None) -> Tuple[bool, Dict[str, Any]]:
+        """使用给定的ClientSession执行连接检测
+        
         Args:
+            session: 发送请求使用的会话
             test_url: 测试URL，如果为None则自动选择
             proxy_url: 代理URL，如果为None则表示直连
+            connect_timeout: TCP连接超时时间（秒），为None时不单独限制
+            total_timeout: 单次请求的总超时时间（秒），为None时使用配置的timeout
             
         Returns:
             Tuple[bool, Dict]: (是否成功, 结果详情)
@@ -542,203 +601,206 @@ class ProxyChecker:
         mode_str = "代理" if is_proxy_mode else "直连"
         
         try:
-            # 创建ClientSession
-            async with aiohttp.ClientSession() as session:
-                # 为每次重试选择不同的URL
-                for attempt in range(self.max_retries + 1):
-                    try:
-                        # 构建请求参数
-                        request_kwargs = {
-                            'timeout': self.timeout,
-                            'headers': {'User-Agent': self.DEFAULT_USER_AGENT}
-                        }
+            # 连接超时与总超时分开设置，失效代理可以在连接阶段快速失败
+            timeout = aiohttp.ClientTimeout(
+                total=total_timeout if total_timeout is not None else self.timeout,
+                sock_connect=connect_timeout
+            )
+            # 为每次重试选择不同的URL
+            for attempt in range(self.max_retries + 1):
+                try:
+                    # 构建请求参数
+                    request_kwargs = {
+                        'timeout': timeout,
+                        'headers': {'User-Agent': self.DEFAULT_USER_AGENT}
+                    }
+                    
+                    # 如果是代理模式，添加代理参数
+                    if is_proxy_mode:
+                        request_kwargs['proxy'] = proxy_url
                         
-                        # 如果是代理模式，添加代理参数
-                        if is_proxy_mode:
-                            request_kwargs['proxy'] = proxy_url
-                            
-                        # 发送请求
-                        async with session.get(test_url, **request_kwargs) as response:
-                            if response.status != 200:
-                                # 检查是否遇到反爬状态码
-                                if response.status in self.RATE_LIMIT_STATUS_CODES:
-                                    # 检查是否是IP地区检测API
-                                    is_ip_api = False
-                                    if self.ip_detector:
-                                        for api in self.ip_detector.ip_apis:
-                                            if api.get("url") == test_url:
-                                                is_ip_api = True
-                                                self.ip_detector.update_api_state(test_url, False)
-                                                break
-                                    
-                                    # 如果不是IP检测API，则标记URL为被封禁
-                                    if not is_ip_api:
-                                        self._mark_url_blocked(test_url, response.status)
-                                    
-                                    # 如果还有重试机会，则换一个URL重试
-                                    if attempt < self.max_retries:
-                                        new_test_url = self._get_next_test_url()
-                                        if new_test_url:
-                                            test_url = new_test_url
-                                            result['test_url'] = test_url
-                                            logger.debug(f"检测到可能的反爬限制，切换到新URL: {test_url}")
-                                            await asyncio.sleep(1)  # 重试前等待一秒
-                                            continue
+                    # 发送请求
+                    async with session.get(test_url, **request_kwargs) as response:
+                        if response.status != 200:
+                            # 检查是否遇到反爬状态码
+                            if response.status in self.RATE_LIMIT_STATUS_CODES:
+                                # 检查是否是IP地区检测API
+                                is_ip_api = False
+                                if self.ip_detector:
+                                    for api in self.ip_detector.ip_apis:
+                                        if api.get("url") == test_url:
+                                            is_ip_api = True
+                                            self.ip_detector.update_api_state(test_url, False)
+                                            break
                                 
-                                result['error'] = f"HTTP错误: {response.status}"
-                                return False, result
+                                # 如果不是IP检测API，则标记URL为被封禁
+                                if not is_ip_api:
+                                    self._mark_url_blocked(test_url, response.status)
+                                
+                                # 如果还有重试机会，则换一个URL重试
+                                if attempt < self.max_retries:
+                                    new_test_url = self._get_next_test_url()
+                                    if new_test_url:
+                                        test_url = new_test_url
+                                        result['test_url'] = test_url
+                                        logger.debug(f"检测到可能的反爬限制，切换到新URL: {test_url}")
+                                        await asyncio.sleep(1)  # 重试前等待一秒
+                                        continue
                             
-                            # 计算响应时间
-                            result['response_time'] = round((time.time() - start_time) * 1000)  # 毫秒
+                            result['error'] = f"HTTP错误: {response.status}"
+                            return False, result
+                        
+                        # 计算响应时间
+                        result['response_time'] = round((time.time() - start_time) * 1000)  # 毫秒
+                        
+                        # 获取响应内容
+                        try:
+                            response_json = await response.json()
                             
-                            # 获取响应内容
+                            # 尝试提取IP地址
                             try:
-                                response_json = await response.json()
-                                
-                                # 尝试提取IP地址
-                                try:
-                                    # 查找匹配的API配置以获取ip_path
-                                    api_config = None
-                                    if self.ip_detector:
-                                        for api in self.ip_detector.ip_apis:
-                                            if api.get("url") == test_url:
-                                                api_config = api
-                                                break
-                                    
-                                    # 首先尝试使用配置的ip_path提取IP
-                                    if api_config and "ip_path" in api_config and api_config["ip_path"]:
-                                        ip_path = api_config["ip_path"]
-                                        paths = ip_path.split(".")
-                                        ip_value = response_json
-                                        for path in paths:
-                                            if isinstance(ip_value, dict) and path in ip_value:
-                                                ip_value = ip_value[path]
-                                            else:
-                                                ip_value = None
-                                                break
-                                        
-                                        if ip_value:
-                                            result['ip'] = str(ip_value)
-                                            logger.debug(f"使用配置的ip_path '{ip_path}' 成功提取IP: {result['ip']}")
-                                    
-                                    # 如果上面未提取到IP，则使用常见路径尝试提取（兼容旧代码）
-                                    if 'ip' not in result or not result['ip']:
-                                        if 'ipdata' in response_json and 'ip' in response_json['ipdata']:
-                                            result['ip'] = response_json['ipdata']['ip']
-                                        elif 'ipinfo' in response_json and 'ip' in response_json['ipinfo']:
-                                            result['ip'] = response_json['ipinfo']['ip']
-                                        elif 'ip' in response_json:
-                                            result['ip'] = response_json['ip']
-                                        elif 'ipAddress' in response_json:
-                                            result['ip'] = response_json['ipAddress']
-                                        elif 'ip_address' in response_json:
-                                            result['ip'] = response_json['ip_address']
-                                        elif 'query' in response_json:
-                                            result['ip'] = response_json['query']
-                                        elif 'ipv4' in response_json:
-                                            result['ip'] = response_json['ipv4']
-                                        elif 'IPV4' in response_json:
-                                            result['ip'] = response_json['IPV4']
-                                        elif 'IP' in response_json:
-                                            result['ip'] = response_json['IP']
-                                except Exception as e:
-                                    logger.debug(f"提取IP地址时出错: {str(e)}")
-                                    # 解析错误不影响连通性检测结果
-                                
-                                # 检查IP地区（如果需要）
-                                if not self.ignore_ip_check and self.ip_detector:
-                                    # 查找匹配的API配置
-                                    api_config = None
+                                # 查找匹配的API配置以获取ip_path
+                                api_config = None
+                                if self.ip_detector:
                                     for api in self.ip_detector.ip_apis:
                                         if api.get("url") == test_url:
                                             api_config = api
-                                            # 标记API调用成功
-                                            self.ip_detector.update_api_state(test_url, True)
+                                            break
+                                
+                                # 首先尝试使用配置的ip_path提取IP
+                                if api_config and "ip_path" in api_config and api_config["ip_path"]:
+                                    ip_path = api_config["ip_path"]
+                                    paths = ip_path.split(".")
+                                    ip_value = response_json
+                                    for path in paths:
+                                        if isinstance(ip_value, dict) and path in ip_value:
+                                            ip_value = ip_value[path]
+                                        else:
+                                            ip_value = None
                                             break
                                     
-                                    # 如果找到匹配的API配置，则提取国家代码
-                                    if api_config:
-                                        country_code = self.ip_detector.extract_country_code(response_json, api_config)
-                                        result['country_code'] = country_code
+                                    if ip_value:
+                                        result['ip'] = str(ip_value)
+                                        logger.debug(f"使用配置的ip_path '{ip_path}' 成功提取IP: {result['ip']}")
+                                
+                                # 如果上面未提取到IP，则使用常见路径尝试提取（兼容旧代码）
+                                if 'ip' not in result or not result['ip']:
+                                    if 'ipdata' in response_json and 'ip' in response_json['ipdata']:
+                                        result['ip'] = response_json['ipdata']['ip']
+                                    elif 'ipinfo' in response_json and 'ip' in response_json['ipinfo']:
+                                        result['ip'] = response_json['ipinfo']['ip']
+                                    elif 'ip' in response_json:
+                                        result['ip'] = response_json['ip']
+                                    elif 'ipAddress' in response_json:
+                                        result['ip'] = response_json['ipAddress']
+                                    elif 'ip_address' in response_json:
+                                        result['ip'] = response_json['ip_address']
+                                    elif 'query' in response_json:
+                                        result['ip'] = response_json['query']
+                                    elif 'ipv4' in response_json:
+                                        result['ip'] = response_json['ipv4']
+                                    elif 'IPV4' in response_json:
+                                        result['ip'] = response_json['IPV4']
+                                    elif 'IP' in response_json:
+                                        result['ip'] = response_json['IP']
+                            except Exception as e:
+                                logger.debug(f"提取IP地址时出错: {str(e)}")
+                                # 解析错误不影响连通性检测结果
+                            
+                            # 检查IP地区（如果需要）
+                            if not self.ignore_ip_check and self.ip_detector:
+                                # 查找匹配的API配置
+                                api_config = None
+                                for api in self.ip_detector.ip_apis:
+                                    if api.get("url") == test_url:
+                                        api_config = api
+                                        # 标记API调用成功
+                                        self.ip_detector.update_api_state(test_url, True)
+                                        break
+                                
+                                # 如果找到匹配的API配置，则提取国家代码
+                                if api_config:
+                                    country_code = self.ip_detector.extract_country_code(response_json, api_config)
+                                    result['country_code'] = country_code
+                                    
+                                    # 获取国家名称供显示
+                                    if country_code:
+                                        result['country_name'] = self.country_mapper.get_country_name(country_code)
+                                        result['country_english_name'] = self.country_mapper.get_country_english_name(country_code)
                                         
-                                        # 获取国家名称供显示
-                                        if country_code:
-                                            result['country_name'] = self.country_mapper.get_country_name(country_code)
-                                            result['country_english_name'] = self.country_mapper.get_country_english_name(country_code)
-                                            
-                                            # 检查国家/地区是否匹配
-                                            is_match = self.ip_detector.match_country_code(country_code, self.target_iso)
-                                            result['country_match'] = is_match
-                                            
-                                            # 获取检测到的国家名称（用于日志显示）
-                                            detected_name = self.country_mapper.get_country_name(country_code) or country_code
+                                        # 检查国家/地区是否匹配
+                                        is_match = self.ip_detector.match_country_code(country_code, self.target_iso)
+                                        result['country_match'] = is_match
+                                        
+                                        # 获取检测到的国家名称（用于日志显示）
+                                        detected_name = self.country_mapper.get_country_name(country_code) or country_code
+                                        
+                                        # 日志记录更详细的匹配信息
+                                        if is_match:
+                                            logger.debug(f"{mode_str}IP地区匹配成功: 检测到 {country_code}({detected_name}), 目标国家 {self.target_iso}({self.target_country_name})")
+                                        else:
+                                            logger.debug(f"{mode_str}IP地区不匹配: 检测到 {country_code}({detected_name}), 目标国家 {self.target_iso}({self.target_country_name})")
                                             
-                                            # 日志记录更详细的匹配信息
-                                            if is_match:
-                                                logger.debug(f"{mode_str}IP地区匹配成功: 检测到 {country_code}({detected_name}), 目标国家 {self.target_iso}({self.target_country_name})")
-                                            else:
-                                                logger.debug(f"{mode_str}IP地区不匹配: 检测到 {country_code}({detected_name}), 目标国家 {self.target_iso}({self.target_country_name})")
-                                                
-                                            # 如果不匹配，且用户不忽略IP检查，则标记为失败
-                                            if not is_match and not self.ignore_ip_check:
-                                                result['success'] = False
-                                                result['error'] = f"IP地区不匹配: {detected_name}({country_code})，期望: {self.target_country_name}({self.target_iso})"
-                                                return False, result
-                                        # 如果未忽略IP检查但无法获取国家代码，则也标记为失败
-                                        elif not self.ignore_ip_check:
-                                            logger.debug(f"{mode_str}IP地区检测失败: 无法获取IP所在地信息")
+                                        # 如果不匹配，且用户不忽略IP检查，则标记为失败
+                                        if not is_match and not self.ignore_ip_check:
                                             result['success'] = False
-                                            result['error'] = "无法获取IP所在地信息，检测失败"
+                                            result['error'] = f"IP地区不匹配: {detected_name}({country_code})，期望: {self.target_country_name}({self.target_iso})"
                                             return False, result
-                            except Exception as e:
-                                logger.debug(f"处理响应JSON时出错: {str(e)}")
-                                # 解析错误不影响连通性检测结果
-                            
-                            result['success'] = True
-                            logger.debug(f"{mode_str}检查成功: {proxy_url or '直连'}, 响应时间: {result['response_time']}ms, URL: {test_url}")
-                            return True, result
-                            
-                    except asyncio.TimeoutError:
-                        result['error'] = "连接超时"
-                    except aiohttp.ClientProxyConnectionError:
-                        result['error'] = "代理连接错误"
-                        # 代理错误是致命问题，无需继续尝试
-                        if is_proxy_mode:
-                            return False, result
-                    except aiohttp.ClientSSLError:
-                        result['error'] = "SSL错误"
-                    except Exception as e:
-                        # 处理IP检测API可能的失败
-                        is_ip_api = False
-                        if self.ip_detector:
-                            for api in self.ip_detector.ip_apis:
-                                if api.get("url") == test_url:
-                                    is_ip_api = True
-                                    self.ip_detector.update_api_state(test_url, False)
-                                    break
+                                    # 如果未忽略IP检查但无法获取国家代码，则也标记为失败
+                                    elif not self.ignore_ip_check:
+                                        logger.debug(f"{mode_str}IP地区检测失败: 无法获取IP所在地信息")
+                                        result['success'] = False
+                                        result['error'] = "无法获取IP所在地信息，检测失败"
+                                        return False, result
+                        except Exception as e:
+                            logger.debug(f"处理响应JSON时出错: {str(e)}")
+                            # 解析错误不影响连通性检测结果
                         
-                        # 检查错误消息中是否包含反爬相关关键词
-                        error_str = str(e).lower()
-                        if any(kw in error_str for kw in ["forbidden", "too many requests", "rate limit", "blocked", "banned"]):
-                            if not is_ip_api:
-                                self._mark_url_blocked(test_url)
-                            
-                            # 如果还有重试机会，则换一个URL重试
-                            if attempt < self.max_retries:
-                                new_test_url = self._get_next_test_url()
-                                if new_test_url:
-                                    test_url = new_test_url
-                                    result['test_url'] = test_url
-                                    logger.debug(f"检测到可能的反爬限制，切换到新URL: {test_url}")
-                                    await asyncio.sleep(1)  # 重试前等待一秒
-                                    continue
+                        result['success'] = True
+                        logger.debug(f"{mode_str}检查成功: {proxy_url or '直连'}, 响应时间: {result['response_time']}ms, URL: {test_url}")
+                        return True, result
                         
-                        result['error'] = f"未知错误: {str(e)}"
+                except asyncio.TimeoutError:
+                    result['error'] = "连接超时"
+                except aiohttp.ClientProxyConnectionError:
+                    result['error'] = "代理连接错误"
+                    # 代理错误是致命问题，无需继续尝试
+                    if is_proxy_mode:
+                        return False, result
+                except aiohttp.ClientSSLError:
+                    result['error'] = "SSL错误"
+                except Exception as e:
+                    # 处理IP检测API可能的失败
+                    is_ip_api = False
+                    if self.ip_detector:
+                        for api in self.ip_detector.ip_apis:
+                            if api.get("url") == test_url:
+                                is_ip_api = True
+                                self.ip_detector.update_api_state(test_url, False)
+                                break
                     
-                    # 如果还有重试机会，则等待后重试
-                    if attempt < self.max_retries:
-                        await asyncio.sleep(1)  # 重试前等待一秒
+                    # 检查错误消息中是否包含反爬相关关键词
+                    error_str = str(e).lower()
+                    if any(kw in error_str for kw in ["forbidden", "too many requests", "rate limit", "blocked", "banned"]):
+                        if not is_ip_api:
+                            self._mark_url_blocked(test_url)
+                        
+                        # 如果还有重试机会，则换一个URL重试
+                        if attempt < self.max_retries:
+                            new_test_url = self._get_next_test_url()
+                            if new_test_url:
+                                test_url = new_test_url
+                                result['test_url'] = test_url
+                                logger.debug(f"检测到可能的反爬限制，切换到新URL: {test_url}")
+                                await asyncio.sleep(1)  # 重试前等待一秒
+                                continue
+                    
+                    result['error'] = f"未知错误: {str(e)}"
                 
+                # 如果还有重试机会，则等待后重试
+                if attempt < self.max_retries:
+                    await asyncio.sleep(1)  # 重试前等待一秒
+            
         except Exception as e:
             result['error'] = f"未知错误: {str(e)}"
             
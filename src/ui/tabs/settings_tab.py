@@ -1,13 +1,21 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                              QGroupBox, QRadioButton, QLineEdit, 
                              QComboBox, QPushButton, QLabel, 
-                             QFormLayout, QFrame, QDialog, QCheckBox, QSpinBox, QProgressBar)
+                             QFormLayout, QFrame, QDialog, QCheckBox, QSpinBox, QProgressBar,
+                             QApplication)
 from PyQt6.QtCore import QTimer, QThread, pyqtSignal
 from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
 from src.core.geo.country_mapper import get_mapper
 
+# 固定代理检测的超时设置（秒）：连接阶段快速失败，整体请求允许稍长
+PROXY_CHECK_CONNECT_TIMEOUT = 0.5
+PROXY_CHECK_TOTAL_TIMEOUT = 5.0
+
 class SettingsTab(QWidget):
+    # 把回调投递到UI线程执行，参数为无参可调用对象
+    _invoke_in_ui = pyqtSignal(object)
+    
     def __init__(self):
         super().__init__()
         self.config_manager = ConfigManager()
@@ -17,6 +25,21 @@ class SettingsTab(QWidget):
         # 获取国家映射器
         self.country_mapper = get_mapper()
         
+        # 代理检查器在多次检测之间复用，其ClientSession常驻在后台事件循环中；
+        # 第一次检测时才在后台事件循环线程中创建，不占用界面构造时间
+        self._proxy_checker = None
+        # 代理检查器加载配置时配置文件的签名，文件变化后才重新加载
+        self._proxy_checker_config = None
+        # 标签页是子控件，不会收到closeEvent，在应用退出前释放会话并停止后台事件循环
+        QApplication.instance().aboutToQuit.connect(self._on_about_to_quit)
+        
+        # 状态消息的重置定时器，重复启动会取消上一次未触发的重置
+        self._status_reset_timer = QTimer(self)
+        self._status_reset_timer.setSingleShot(True)
+        self._status_reset_timer.timeout.connect(self.reset_status_label)
+        
+        self._invoke_in_ui.connect(self._call_in_ui)
+        
         self.init_ui()
         
         # 使用延迟加载设置
@@ -432,7 +455,7 @@ class SettingsTab(QWidget):
                 
                 # 显示导入结果到状态标签
                 self.status_label.setText(f"成功导入 {success_count} 个代理，{fail_count} 个代理导入失败")
-                QTimer.singleShot(5000, lambda: self.status_label.setText(""))
+                self._status_reset_timer.start(5000)
                 
                 # 如果代理池管理对话框已经打开，则刷新显示
                 if hasattr(self, 'proxy_pool_dialog') and self.proxy_pool_dialog is not None and self.proxy_pool_dialog.isVisible():
@@ -475,13 +498,13 @@ class SettingsTab(QWidget):
             if not self.fixed_proxy_host.text().strip():
                 self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
                 self.status_label.setText("错误: 固定代理的主机地址不能为空")
-                QTimer.singleShot(5000, lambda: self.reset_status_label())
+                self._status_reset_timer.start(5000)
                 return
                 
             if not self.fixed_proxy_port.text().strip():
                 self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
                 self.status_label.setText("错误: 固定代理的端口不能为空")
-                QTimer.singleShot(5000, lambda: self.reset_status_label())
+                self._status_reset_timer.start(5000)
                 return
                 
             # 尝试验证端口是否为数字
@@ -490,19 +513,19 @@ class SettingsTab(QWidget):
                 if port <= 0 or port > 65535:
                     self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
                     self.status_label.setText("错误: 端口必须在1-65535之间")
-                    QTimer.singleShot(5000, lambda: self.reset_status_label())
+                    self._status_reset_timer.start(5000)
                     return
             except ValueError:
                 self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
                 self.status_label.setText("错误: 端口必须是数字")
-                QTimer.singleShot(5000, lambda: self.reset_status_label())
+                self._status_reset_timer.start(5000)
                 return
         
         # 如果选择了API获取，验证API URL不能为空
         if proxy_source == "api" and not self.api_url.text().strip():
             self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
             self.status_label.setText("错误: API链接不能为空")
-            QTimer.singleShot(5000, lambda: self.reset_status_label())
+            self._status_reset_timer.start(5000)
             return
             
         # 不再需要验证线程数，因为QSpinBox已经限制了输入范围
@@ -566,12 +589,12 @@ class SettingsTab(QWidget):
             self.status_label.setStyleSheet("color: #28A745; font-weight: bold;")
             self.status_label.setText("设置保存成功")
             # 3秒后清除消息
-            QTimer.singleShot(3000, lambda: self.status_label.setText(""))
+            self._status_reset_timer.start(3000)
         except Exception as e:
             self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
             self.status_label.setText(f"保存失败: {str(e)}")
             # 5秒后清除错误消息
-            QTimer.singleShot(5000, lambda: self.reset_status_label())
+            self._status_reset_timer.start(5000)
             
     def reset_status_label(self):
         """重置状态标签为默认状态"""
@@ -705,7 +728,7 @@ class SettingsTab(QWidget):
         self.status_label.setStyleSheet("color: #28A745; font-weight: bold;")
         self.status_label.setText("固定代理信息已清空")
         # 2秒后清除消息
-        QTimer.singleShot(2000, lambda: self.status_label.setText("")) 
+        self._status_reset_timer.start(2000)
 
     def update_country_selector_visibility(self):
         """更新国家选择器的可见性，根据是否勾选"忽略IP所在地检查"""
@@ -762,7 +785,7 @@ class SettingsTab(QWidget):
         if not host or not port:
             self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
             self.status_label.setText("错误: 请先填写代理主机和端口")
-            QTimer.singleShot(3000, lambda: self.reset_status_label())
+            self._status_reset_timer.start(3000)
             return
             
         try:
@@ -771,12 +794,12 @@ class SettingsTab(QWidget):
             if port <= 0 or port > 65535:
                 self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
                 self.status_label.setText("错误: 端口必须在1-65535之间")
-                QTimer.singleShot(3000, lambda: self.reset_status_label())
+                self._status_reset_timer.start(3000)
                 return
         except ValueError:
             self.status_label.setStyleSheet("color: #DC3545; font-weight: bold;")
             self.status_label.setText("错误: 端口必须是数字")
-            QTimer.singleShot(3000, lambda: self.reset_status_label())
+            self._status_reset_timer.start(3000)
             return
         
         # 构建代理信息
@@ -791,6 +814,8 @@ class SettingsTab(QWidget):
         # 更新状态提示
         self.status_label.setStyleSheet("color: #17A2B8; font-weight: bold;")
         self.status_label.setText("正在检测代理，请稍候...")
+        # 检测过程中不自动清除提示
+        self._status_reset_timer.stop()
         
         # 禁用检测按钮，防止重复点击
         sender = self.sender()
@@ -808,54 +833,26 @@ class SettingsTab(QWidget):
             proxy: 代理信息字典
             button: 触发检测的按钮
         """
-        from src.core.proxy.proxy_checker import ProxyChecker
-        from src.utils.config_manager import ConfigManager
-        from src.utils.logger import get_logger
-        import asyncio
-        from PyQt6.QtCore import QThread, pyqtSignal, QTimer
+        from src.utils.async_runner import get_async_runner
         
         logger = get_logger()
         
-        # 创建工作线程类
-        class ProxyCheckThread(QThread):
-            # 结果信号
-            check_finished = pyqtSignal(bool, dict)
+        async def run_check():
+            checker = self._get_proxy_checker()
             
-            def __init__(self, proxy_info, config_manager):
-                super().__init__()
-                self.proxy_info = proxy_info
-                self.config_manager = config_manager
-                
-            def run(self):
-                try:
-                    # 创建事件循环
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    # 初始化代理检查器
-                    checker = ProxyChecker(self.config_manager)
-                    
-                    # 格式化代理URL
-                    proxy_url = checker.format_proxy_url(self.proxy_info)
-                    if not proxy_url:
-                        self.check_finished.emit(False, {'success': False, 'error': "代理格式无效"})
-                        return
-                    
-                    # 执行检测
-                    success, result = loop.run_until_complete(checker._check_connection_async(None, proxy_url))
-                    self.check_finished.emit(success, result)
-                    
-                except Exception as e:
-                    logger.error(f"代理检测线程中发生错误: {str(e)}")
-                    self.check_finished.emit(False, {'success': False, 'error': f"检测错误: {str(e)}"})
-                finally:
-                    if loop:
-                        loop.close()
-        
-        # 创建并启动线程
-        self.check_thread = ProxyCheckThread(proxy, self.config_manager)
-        
-        # 连接结果信号
+            # 格式化代理URL
+            proxy_url = checker.format_proxy_url(proxy)
+            if not proxy_url:
+                return False, {'success': False, 'error': "代理格式无效"}
+            
+            # 执行检测
+            return await checker._check_connection_async(
+                None, proxy_url,
+                connect_timeout=PROXY_CHECK_CONNECT_TIMEOUT,
+                total_timeout=PROXY_CHECK_TOTAL_TIMEOUT
+            )
+        
+        # 处理检测结果（在UI线程中执行）
         def on_check_finished(success, result):
             try:
                 # 处理检测结果
@@ -878,9 +875,7 @@ class SettingsTab(QWidget):
                     
                     # 如果有国家代码，显示国家/地区信息
                     if country_code:
-                        from src.core.geo.country_mapper import get_mapper
-                        country_mapper = get_mapper()
-                        country_name = country_mapper.get_country_name(country_code) or "未知"
+                        country_name = self._get_country_name(country_code)
                         msg += f", 所在地: {country_name}({country_code})"
                     
                     # 更新状态显示
@@ -906,13 +901,69 @@ class SettingsTab(QWidget):
                     button.setEnabled(True)
                     button.setText("代理检测")
                 # 设置定时器，5秒后清除状态消息
-                QTimer.singleShot(5000, lambda: self.reset_status_label())
+                self._status_reset_timer.start(5000)
+        
+        def on_future_done(future):
+            # 在后台事件循环线程中调用，只传递回调引用到UI线程，不复制结果
+            def deliver():
+                try:
+                    success, result = future.result()
+                except Exception as e:
+                    logger.error(f"代理检测过程中发生错误: {str(e)}")
+                    success, result = False, {'success': False, 'error': f"检测错误: {str(e)}"}
+                on_check_finished(success, result)
+            self._invoke_in_ui.emit(deliver)
+        
+        # 在常驻事件循环中执行检测，复用ClientSession
+        get_async_runner().submit(run_check()).add_done_callback(on_future_done)
+    
+    def _call_in_ui(self, callback):
+        """在UI线程中执行投递过来的回调"""
+        callback()
+    
+    def _get_proxy_checker(self):
+        """获取复用的代理检查器，只在后台事件循环线程中调用
         
-        # 连接信号
-        self.check_thread.check_finished.connect(on_check_finished)
+        第一次调用时创建检查器；之后只有配置文件发生变化时才重新加载配置，
+        确保使用最新保存的检测设置。
+        
+        Returns:
+            ProxyChecker: 代理检查器
+        """
+        signature = self.config_manager.get_file_signature()
+        if self._proxy_checker is None:
+            from src.core.proxy.proxy_checker import ProxyChecker
+            self._proxy_checker = ProxyChecker(self.config_manager)
+        elif signature != self._proxy_checker_config:
+            self._proxy_checker.reload_config()
+        self._proxy_checker_config = signature
+        return self._proxy_checker
+    
+    def _on_about_to_quit(self):
+        """应用退出前关闭代理检查器的ClientSession，然后停止后台事件循环"""
+        from src.utils.async_runner import get_async_runner
         
-        # 启动线程
-        self.check_thread.start()
+        runner = get_async_runner()
+        if not runner.is_running():
+            return
+        try:
+            if self._proxy_checker is not None:
+                runner.submit(self._proxy_checker.close_session()).result(timeout=5)
+        except Exception as e:
+            get_logger().error(f"关闭代理检查器会话失败: {str(e)}")
+        finally:
+            runner.stop()
+    
+    def _get_country_name(self, country_code):
+        """获取国家/地区名称，查询结果由国家映射器缓存
+        
+        Args:
+            country_code: 国家/地区代码
+            
+        Returns:
+            str: 国家/地区名称，未找到则返回"未知"
+        """
+        return self.country_mapper.get_country_name(country_code) or "未知"
     
     def _reset_check_button(self, button):
         """重置检测按钮状态"""
@@ -7,16 +7,23 @@ class LogTextEdit(QTextEdit):
         super().__init__(parent)
         self.placeholder = placeholder
         self.setReadOnly(True)  # 设置为只读
+        # 缓存文档是否为空，避免每次绘制都遍历整个文档
+        self._show_placeholder = True
+        self.textChanged.connect(self._update_placeholder_state)
+        
+    def _update_placeholder_state(self):
+        """文本改变时更新占位符显示状态"""
+        self._show_placeholder = self.document().isEmpty()
         
     def paintEvent(self, event):
         """重写绘制事件，添加占位符文本"""
         super().paintEvent(event)
         
-        if self.toPlainText() == "" and self.placeholder:
+        if self._show_placeholder and self.placeholder:
             painter = QPainter(self.viewport())
             painter.setOpacity(0.5)  # 设置透明度
             painter.setPen(QColor("#6C757D"))  # 设置颜色为灰色
             rect = self.rect()
             rect.setLeft(rect.left() + 9)  # 添加左边距，与正常文本对齐
             rect.setTop(rect.top() + 9)    # 添加上边距，与正常文本对齐
-            painter.drawText(rect, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft, self.placeholder) 
\ No newline at end of file
+            painter.drawText(rect, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft, self.placeholder)
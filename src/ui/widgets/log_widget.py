@@ -1,9 +1,55 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QProgressBar, QLabel
 from PyQt6.QtCore import Qt, QTimer
-from datetime import datetime
 from queue import Queue
 from .custom_text_edit import LogTextEdit
-from src.utils.logger import get_logger
+from src.utils.logger import get_logger, format_log_line
+
+# 日志组件样式表，通过objectName选择器在QApplication上统一应用一次，
+# 避免每个组件实例都重新解析样式表
+_CLEAR_BTN_QSS = """
+    QPushButton#LogClearBtn {
+        background-color: #DC3545;
+        color: white;
+        border: none;
+        padding: 4px 8px;
+        border-radius: 4px;
+    }
+    QPushButton#LogClearBtn:hover {
+        background-color: #C82333;
+    }
+    QPushButton#LogClearBtn:pressed {
+        background-color: #BD2130;
+    }
+"""
+
+_PROGRESS_QSS = """
+    QProgressBar#LogProgressBar {
+        background-color: #F8F9FA;
+        border: none;
+        border-radius: 3px;
+        text-align: center;
+        color: #6C757D;
+        font-size: 12px;
+    }
+    QProgressBar#LogProgressBar::chunk {
+        background-color: #28A745;
+        border-radius: 3px;
+    }
+"""
+
+_LOG_TEXT_QSS = """
+    QTextEdit#LogTextEdit {
+        background-color: #F8F9FA;
+        border: 1px solid #E9ECEF;
+        border-radius: 4px;
+        padding: 8px;
+        font-family: "Microsoft YaHei", "微软雅黑";
+        font-size: 13px;
+        line-height: 1.5;
+    }
+"""
+
+LOG_WIDGET_QSS = _CLEAR_BTN_QSS + _PROGRESS_QSS + _LOG_TEXT_QSS
 
 class LogWidget(QWidget):
     def __init__(self):
@@ -13,6 +59,12 @@ class LogWidget(QWidget):
         self.log_timer = QTimer(self)  # 定时器用于处理队列中的日志
         self.log_timer.timeout.connect(self.process_log_queue)
         self.log_timer.start(100)  # 每100ms检查一次队列
+        self._last_progress = (-1, -1)  # 上一次的进度，用于跳过重复更新
+        # 进度轮询定时器，任务进行期间约30Hz读取最新进度，代替逐条处理进度信号
+        self._progress_manager = None
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(33)
+        self.progress_timer.timeout.connect(self.poll_progress)
         self.init_ui()
         self.connect_signals()
         
@@ -27,21 +79,7 @@ class LogWidget(QWidget):
         # 清空按钮
         clear_btn = QPushButton("清空日志")
         clear_btn.setFixedWidth(80)
-        clear_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #DC3545;
-                color: white;
-                border: none;
-                padding: 4px 8px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #C82333;
-            }
-            QPushButton:pressed {
-                background-color: #BD2130;
-            }
-        """)
+        clear_btn.setObjectName("LogClearBtn")
         clear_btn.clicked.connect(self.clear_log)
         
         toolbar.addWidget(clear_btn)
@@ -63,20 +101,7 @@ class LogWidget(QWidget):
         self.progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)  # 文本居中对齐
         # 初始状态下不显示文本
         self.progress_bar.setTextVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                background-color: #F8F9FA;
-                border: none;
-                border-radius: 3px;
-                text-align: center;
-                color: #6C757D;
-                font-size: 12px;
-            }
-            QProgressBar::chunk {
-                background-color: #28A745;
-                border-radius: 3px;
-            }
-        """)
+        self.progress_bar.setObjectName("LogProgressBar")
         
         progress_layout.addWidget(self.progress_bar, stretch=1)  # 进度条占据大部分空间
         
@@ -85,17 +110,7 @@ class LogWidget(QWidget):
         
         # 创建日志文本框
         self.log_text = LogTextEdit(placeholder="日志信息将在这里显示...")
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #F8F9FA;
-                border: 1px solid #E9ECEF;
-                border-radius: 4px;
-                padding: 8px;
-                font-family: "Microsoft YaHei", "微软雅黑";
-                font-size: 13px;
-                line-height: 1.5;
-            }
-        """)
+        self.log_text.setObjectName("LogTextEdit")
         
         # 连接滚动条值改变信号
         self.log_text.verticalScrollBar().valueChanged.connect(self.on_scroll)
@@ -110,32 +125,33 @@ class LogWidget(QWidget):
             # 获取Logger实例
             logger = get_logger()
             
-            # 连接日志信号，确保使用Qt.QueuedConnection
-            logger.signals.log_message.connect(self.on_log_message, Qt.ConnectionType.QueuedConnection)
+            # 连接结构化日志信号，确保使用Qt.QueuedConnection
+            logger.signals.log_record.connect(self.on_log_record, Qt.ConnectionType.QueuedConnection)
             
             # 连接进度管理器信号
             from src.utils.progress_manager import get_progress_manager
             progress_manager = get_progress_manager()
-            progress_manager.signals.progress_update.connect(self.update_progress, Qt.ConnectionType.QueuedConnection)
+            progress_manager.signals.progress_update.connect(self.on_progress_update, Qt.ConnectionType.QueuedConnection)
             progress_manager.signals.progress_reset.connect(self.reset_progress, Qt.ConnectionType.QueuedConnection)
+            # 任务开始后改为定时轮询中间进度，完成或重置时停止轮询
+            progress_manager.signals.progress_started.connect(self.start_progress_polling, Qt.ConnectionType.QueuedConnection)
+            self._progress_manager = progress_manager
         except Exception as e:
             print(f"连接信号失败: {str(e)}")
         
-    def on_log_message(self, message: str):
-        """接收日志信号并添加到队列
+    def on_log_record(self, created: float, levelno: int, message: str):
+        """接收结构化日志信号并添加到队列
         
-        日志消息已在logger中格式化，包含时间戳和级别
+        只保存原始数据，格式化推迟到定时器批量处理时进行
         """
-        self.log_queue.put(message)
+        self.log_queue.put((created, levelno, message))
     
     def append_log(self, message: str):
-        """添加日志信息到队列（保留此方法以兼容现有代码）
+        """添加日志信息（保留此方法以兼容现有代码）
         
-        为了兼容原有代码，这里仍然添加时间戳
+        消息交给logger统一格式化（时间戳和级别），再通过日志信号回到本组件
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        formatted_message = f"[{timestamp}] [信息] {message}"
-        self.log_queue.put(formatted_message)
+        get_logger().info(message)
     
     def process_log_queue(self):
         """处理队列中的日志消息"""
@@ -143,8 +159,7 @@ class LogWidget(QWidget):
         # 一次性处理队列中的所有消息
         while not self.log_queue.empty() and len(messages) < 100:  # 限制每次处理的消息数量
             try:
-                message = self.log_queue.get_nowait()
-                messages.append(message)
+                messages.append(format_log_line(*self.log_queue.get_nowait()))
             except:
                 break
         
@@ -187,31 +202,74 @@ class LogWidget(QWidget):
     def closeEvent(self, event):
         """窗口关闭时的处理"""
         self.log_timer.stop()
+        self.stop_progress_polling()
         super().closeEvent(event)
 
+    def start_progress_polling(self, total: int):
+        """任务开始时启动进度轮询定时器
+        Args:
+            total: 任务总数量
+        """
+        if self._progress_manager is None:
+            return
+        self.progress_timer.start()
+
+    def stop_progress_polling(self):
+        """停止进度轮询定时器"""
+        self.progress_timer.stop()
+
+    def on_progress_update(self, current: int, total: int):
+        """接收进度信号，轮询期间只处理最终进度，中间进度由定时器读取"""
+        if self.progress_timer.isActive() and current < total:
+            return
+        self.update_progress(current, total)
+
+    def poll_progress(self):
+        """定时读取进度管理器的最新进度并更新进度条"""
+        current, total, active = self._progress_manager.get_progress()
+        # 进度被重置时由 progress_reset 信号处理
+        if total > 0:
+            self.update_progress(current, total)
+        if not active:
+            self.stop_progress_polling()
+
     def update_progress(self, current: int, total: int):
         """更新进度条和进度文本
         Args:
             current: 当前处理数量
             total: 总数量
         """
+        # 任务已完成时不再需要轮询
+        if 0 < total <= current:
+            self.stop_progress_polling()
+        # 进度未变化时直接返回，避免重复触发重绘
+        if (current, total) == self._last_progress:
+            return
+        last_total = self._last_progress[1]
+        self._last_progress = (current, total)
+        
         try:
             if total > 0:
-                # 设置进度条的最大值为总数量
-                self.progress_bar.setMaximum(total)
+                # 仅在总数变化时设置进度条的最大值
+                if total != last_total:
+                    self.progress_bar.setMaximum(total)
                 # 设置进度条的当前值为当前数量
                 self.progress_bar.setValue(current)
                 # 当current为0时隐藏文本
-                self.progress_bar.setTextVisible(current > 0)
+                text_visible = current > 0
             else:
                 self.progress_bar.setValue(0)
-                self.progress_bar.setTextVisible(False)
+                text_visible = False
+            if text_visible != self.progress_bar.isTextVisible():
+                self.progress_bar.setTextVisible(text_visible)
         except Exception as e:
             print(f"更新进度条失败: {str(e)}")
 
     def reset_progress(self):
         """重置进度条和进度文本"""
+        self.stop_progress_polling()
         try:
+            self._last_progress = (0, self._last_progress[1])
             self.progress_bar.setValue(0)
             self.progress_bar.setTextVisible(False)
         except Exception as e:
@@ -1,12 +1,23 @@
 import os
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication
 
 # 缓存应用名称和基础路径，避免重复获取
 _app_name = None
 _user_dir = None
-_app_dir = None
+
+# 已创建的目录路径缓存，目录只在第一次获取时创建
+_PATHS: Dict[str, Path] = {}
+_STR_PATHS: Dict[str, str] = {}
+
+# 应用主目录下的子目录名称
+_SUB_DIRS = {
+    "logs_dir": "logs",
+    "config_dir": "config",
+    "db_dir": "db",
+    "cache_dir": "cache"
+}
 
 def get_app_name() -> str:
     """获取应用名称
@@ -30,26 +41,42 @@ def get_user_dir() -> str:
         _user_dir = os.path.expanduser("~")
     return _user_dir
 
+def _get_dir(key: str) -> str:
+    """获取缓存的目录路径，第一次获取时构建路径并创建目录
+    
+    Args:
+        key: 目录键名，app_dir 或 _SUB_DIRS 中的键
+        
+    Returns:
+        str: 目录的绝对路径
+    """
+    path = _STR_PATHS.get(key)
+    if path is None:
+        if key == "app_dir":
+            dir_path = Path(get_user_dir()) / get_app_name()
+        else:
+            get_app_dir()
+            dir_path = _PATHS["app_dir"] / _SUB_DIRS[key]
+        ensure_dir_exists(dir_path)
+        _PATHS[key] = dir_path
+        path = _STR_PATHS[key] = str(dir_path)
+    return path
+
 def get_app_dir() -> str:
     """获取应用主目录路径，如果不存在则创建
     
     Returns:
         str: 应用主目录的绝对路径
     """
-    global _app_dir
-    if _app_dir is None:
-        _app_dir = os.path.join(get_user_dir(), get_app_name())
-        ensure_dir_exists(_app_dir)
-    return _app_dir
+    return _get_dir("app_dir")
 
-def ensure_dir_exists(path: str) -> None:
+def ensure_dir_exists(path: Union[str, Path]) -> None:
     """确保目录存在，如果不存在则创建
     
     Args:
         path: 需要确保存在的目录路径
     """
-    if not os.path.exists(path):
-        os.makedirs(path)
+    Path(path).mkdir(parents=True, exist_ok=True)
 
 def get_logs_dir() -> str:
     """获取日志目录路径，如果不存在则创建
@@ -57,9 +84,7 @@ def get_logs_dir() -> str:
     Returns:
         str: 日志目录的绝对路径
     """
-    logs_dir = os.path.join(get_app_dir(), "logs")
-    ensure_dir_exists(logs_dir)
-    return logs_dir
+    return _get_dir("logs_dir")
 
 def get_config_dir() -> str:
     """获取配置文件目录路径，如果不存在则创建
@@ -67,9 +92,7 @@ def get_config_dir() -> str:
     Returns:
         str: 配置目录的绝对路径
     """
-    config_dir = os.path.join(get_app_dir(), "config")
-    ensure_dir_exists(config_dir)
-    return config_dir
+    return _get_dir("config_dir")
 
 def get_db_dir() -> str:
     """获取数据库目录路径，如果不存在则创建
@@ -77,9 +100,7 @@ def get_db_dir() -> str:
     Returns:
         str: 数据库目录的绝对路径
     """
-    db_dir = os.path.join(get_app_dir(), "db")
-    ensure_dir_exists(db_dir)
-    return db_dir
+    return _get_dir("db_dir")
 
 def get_db_path(db_name: str) -> str:
     """获取数据库文件的完整路径
@@ -90,8 +111,8 @@ def get_db_path(db_name: str) -> str:
     Returns:
         str: 数据库文件的绝对路径
     """
-    db_dir = get_db_dir()
-    return os.path.join(db_dir, f"{db_name}.db")
+    get_db_dir()
+    return str(_PATHS["db_dir"] / f"{db_name}.db")
 
 def get_cache_dir() -> str:
     """获取缓存目录路径，如果不存在则创建
@@ -99,9 +120,7 @@ def get_cache_dir() -> str:
     Returns:
         str: 缓存目录的绝对路径
     """
-    cache_dir = os.path.join(get_app_dir(), "cache")
-    ensure_dir_exists(cache_dir)
-    return cache_dir
+    return _get_dir("cache_dir")
 
 def get_config_file_path(filename: str = "settings.json") -> str:
     """获取配置文件的完整路径
@@ -112,8 +131,8 @@ def get_config_file_path(filename: str = "settings.json") -> str:
     Returns:
         str: 配置文件的绝对路径
     """
-    config_dir = get_config_dir()
-    return os.path.join(config_dir, filename)
+    get_config_dir()
+    return str(_PATHS["config_dir"] / filename)
 
 def initialize_app_dirs() -> Dict[str, str]:
     """初始化所有应用目录并返回路径信息
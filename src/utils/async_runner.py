@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+# 单例模式的异步任务运行器
+class AsyncRunner:
+    """在专用后台线程中运行常驻事件循环
+
+    UI代码可以把协程提交到该事件循环中执行，这样依赖事件循环的资源
+    （例如aiohttp.ClientSession）就可以在多次调用之间复用。
+    """
+    _instance = None
+    _lock = threading.RLock()  # 添加线程锁确保并发安全
+
+    @classmethod
+    def instance(cls) -> 'AsyncRunner':
+        """获取AsyncRunner单例实例"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        """初始化运行器，事件循环线程延迟到第一次提交任务时启动"""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取后台事件循环，如果尚未启动则启动"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        """创建事件循环并在守护线程中运行"""
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=_run, name="AsyncRunner", daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def is_running(self) -> bool:
+        """后台事件循环是否已经启动且未关闭"""
+        with self._lock:
+            return self._loop is not None and not self._loop.is_closed()
+
+    def in_loop(self) -> bool:
+        """当前是否运行在后台事件循环中
+
+        Returns:
+            bool: 调用方正在后台事件循环线程中执行时返回True
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return loop is self._loop
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """提交协程到后台事件循环
+
+        Args:
+            coro: 要执行的协程
+
+        Returns:
+            Future: 可在任意线程中等待或添加回调的Future对象
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self) -> None:
+        """停止后台事件循环"""
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+
+# 便捷函数，用于快速访问异步任务运行器
+def get_async_runner() -> AsyncRunner:
+    """获取AsyncRunner实例的便捷方法"""
+    return AsyncRunner.instance()
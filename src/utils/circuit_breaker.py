@@ -1,12 +1,17 @@
 import time
 import asyncio
-from typing import Callable, Dict, Any, Optional, List, Union, Tuple
+from fractions import Fraction
+from collections import deque
+from typing import Callable, Dict, Any, Optional, List, Union, Tuple, Deque
 from enum import Enum, auto
 import threading
 from src.utils.logger import get_logger
 
 logger = get_logger()
 
+# 统计整数中1的个数，Python 3.10+ 使用内置的 int.bit_count
+_popcount = getattr(int, "bit_count", None) or (lambda value: bin(value).count("1"))
+
 class CircuitState(Enum):
     """熔断器状态枚举"""
     CLOSED = auto()     # 关闭状态（正常工作）
@@ -22,6 +27,8 @@ class FailureType(Enum):
 class CircuitBreakerEvent:
     """熔断器事件类"""
     
+    __slots__ = ('state', 'failure_count', 'reason', 'failure_percentage', 'context', 'timestamp')
+    
     def __init__(self, state: CircuitState, failure_count: int, reason: str = None,
                  failure_percentage: float = None, context: Optional[Dict[str, Any]] = None):
         """初始化熔断器事件
@@ -40,6 +47,12 @@ class CircuitBreakerEvent:
         self.context = context or {}
         self.timestamp = time.time()
 
+# 监听器条目：(是否为异步监听器, 回调)，是否异步只在注册时判断一次
+_ListenerEntry = Tuple[bool, Callable]
+
+# 状态转换结果：(事件, 监听器快照)，在锁外分发
+_Transition = Tuple[CircuitBreakerEvent, List[_ListenerEntry]]
+
 class CircuitBreaker:
     """通用熔断器类
     
@@ -57,6 +70,42 @@ class CircuitBreaker:
     - 总失败次数：当在窗口期内的总失败次数达到阈值时触发熔断
     """
     
+    # 熔断器会按任务大量创建，使用 __slots__ 去掉实例 __dict__
+    __slots__ = (
+        'name', 'failure_threshold', 'reset_timeout', 'failure_type', 'window_size',
+        'failure_rate_threshold', 'half_open_max_trials',
+        '_state', '_consecutive_failures', '_last_failure_reason', '_last_state_change',
+        '_open_deadline', '_half_open_trial_count',
+        '_use_bitmask', '_window_mask', '_window_full_mask', '_results_window',
+        '_window_len', '_window_failures',
+        '_check_trip', '_window_enabled', '_min_samples_for_percentage', '_rate_num', '_rate_den',
+        '_lock', '_listeners', '_stats_cache', '_stats_cache_time', '_stats_cache_state',
+        '__weakref__',
+    )
+    
+    # 使用整数位掩码记录窗口结果的最大窗口大小
+    _BITMASK_MAX_WINDOW = 64
+    
+    # get_stats 结果的缓存有效期（秒），供界面轮询时复用
+    _STATS_CACHE_TTL = 0.1
+    
+    # 热路径中频繁使用的全局名称预先绑定为类属性，省去模块全局查找
+    _CLOSED = CircuitState.CLOSED
+    _OPEN = CircuitState.OPEN
+    _HALF_OPEN = CircuitState.HALF_OPEN
+    _monotonic = time.monotonic
+    
+    # 允许的自动状态转换，手动重置不受此限制
+    _ALLOWED_TRANSITIONS = frozenset((
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+        (CircuitState.HALF_OPEN, CircuitState.OPEN),
+    ))
+    
+    # 需要维护结果窗口的失败类型
+    _WINDOW_FAILURE_TYPES = frozenset((FailureType.PERCENTAGE, FailureType.TOTAL))
+    
     def __init__(self, name: str = "default",
                  failure_threshold: int = 5,
                  reset_timeout: int = 60,
@@ -84,24 +133,51 @@ class CircuitBreaker:
         self.half_open_max_trials = half_open_max_trials
         
         # 内部状态
-        self._state = CircuitState.CLOSED
+        self._state = self._CLOSED
         self._consecutive_failures = 0
         self._last_failure_reason = None
-        self._last_state_change = time.time()
+        # 内部计时统一使用单调时钟，避免系统时间调整导致熔断器卡在OPEN状态
+        self._last_state_change = self._monotonic()
+        self._open_deadline = 0.0
         self._half_open_trial_count = 0
         
-        # 窗口期内的结果记录
-        self._results_window: List[bool] = []
+        # 窗口期内的结果记录，并维护窗口内的记录数和失败计数
+        # 窗口不超过64时使用整数位掩码（1表示失败），否则使用环形缓冲区
+        self._use_bitmask = window_size <= self._BITMASK_MAX_WINDOW
+        self._window_mask = 0
+        self._window_full_mask = (1 << max(window_size, 0)) - 1 if self._use_bitmask else 0
+        self._results_window: Optional[Deque[bool]] = None if self._use_bitmask else deque(maxlen=window_size)
+        self._window_len = 0
+        self._window_failures = 0
+        
+        # 失败类型在构造后不再变化，提前绑定对应的熔断检查方法
+        self._check_trip = {
+            FailureType.CONSECUTIVE: self._check_trip_consecutive,
+            FailureType.PERCENTAGE: self._check_trip_percentage,
+            FailureType.TOTAL: self._check_trip_total,
+        }[failure_type]
+        self._window_enabled = failure_type in self._WINDOW_FAILURE_TYPES
+        
+        # 失败百分比模式的参数预先计算：最少样本数，以及把失败率阈值化为整数比，
+        # 判断时用整数乘法代替除法和浮点比较
+        self._min_samples_for_percentage = min(window_size, 3)
+        rate = Fraction(failure_rate_threshold).limit_denominator(1000)
+        self._rate_num = rate.numerator
+        self._rate_den = rate.denominator
         
         # 锁：确保线程安全
+        # 临界区内只有纯状态更新，不会 await，同步和异步路径共用同一把线程锁
         self._lock = threading.RLock()
-        self._async_lock = asyncio.Lock()
         
-        # 事件监听器
-        self._listeners: List[Callable[[CircuitBreakerEvent], None]] = []
-        self._async_listeners: List[Callable[[CircuitBreakerEvent], asyncio.Future]] = []
+        # 事件监听器，同步和异步监听器保存在同一个列表中
+        self._listeners: List[_ListenerEntry] = []
         
-        logger.debug(f"熔断器[{self.name}]已初始化: 类型={failure_type.name}, 阈值={failure_threshold}")
+        # 统计信息缓存，状态变化或超过有效期后重新生成
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_cache_time = 0.0
+        self._stats_cache_state: Optional[CircuitState] = None
+        
+        logger.debug("熔断器[%s]已初始化: 类型=%s, 阈值=%s", self.name, failure_type.name, failure_threshold)
     
     @property
     def state(self) -> CircuitState:
@@ -111,35 +187,66 @@ class CircuitBreaker:
     @property
     def is_closed(self) -> bool:
         """熔断器是否关闭（正常状态）"""
-        return self._state == CircuitState.CLOSED
+        return self._state is self._CLOSED
     
     @property
     def is_open(self) -> bool:
         """熔断器是否打开（熔断状态）"""
-        return self._state == CircuitState.OPEN
+        return self._state is self._OPEN
     
     @property
     def is_half_open(self) -> bool:
         """熔断器是否半开（测试状态）"""
-        return self._state == CircuitState.HALF_OPEN
+        return self._state is self._HALF_OPEN
         
-    def add_listener(self, listener: Callable[[CircuitBreakerEvent], None]) -> None:
-        """添加同步事件监听器
+    def _record(self, ok: bool) -> None:
+        """记录一次结果到窗口中，同步维护窗口内的失败计数
+        
+        Args:
+            ok: 操作是否成功
+        """
+        if self._use_bitmask:
+            self._window_mask = ((self._window_mask << 1) | (0 if ok else 1)) & self._window_full_mask
+            self._window_failures = _popcount(self._window_mask)
+            if self._window_len < self.window_size:
+                self._window_len += 1
+            return
+        
+        window = self._results_window
+        if len(window) == window.maxlen and not window[0]:
+            # 最旧的失败记录即将被挤出窗口
+            self._window_failures -= 1
+        window.append(ok)
+        self._window_len = len(window)
+        if not ok:
+            self._window_failures += 1
+    
+    def _clear_window(self) -> None:
+        """清空窗口内的结果记录"""
+        self._window_mask = 0
+        if self._results_window is not None:
+            self._results_window.clear()
+        self._window_len = 0
+        self._window_failures = 0
+    
+    def add_listener(self, listener: Callable[[CircuitBreakerEvent], Any]) -> None:
+        """添加事件监听器，协程函数会自动识别为异步监听器
         
         Args:
             listener: 监听器函数，接收熔断器事件作为参数
         """
+        is_async = asyncio.iscoroutinefunction(listener)
         with self._lock:
-            self._listeners.append(listener)
+            self._listeners.append((is_async, listener))
     
     def add_async_listener(self, listener: Callable[[CircuitBreakerEvent], asyncio.Future]) -> None:
-        """添加异步事件监听器
+        """添加异步事件监听器（兼容旧接口，add_listener 已能自动识别协程函数）
         
         Args:
             listener: 异步监听器函数，接收熔断器事件作为参数
         """
         with self._lock:
-            self._async_listeners.append(listener)
+            self._listeners.append((True, listener))
     
     def remove_listener(self, listener: Callable) -> bool:
         """移除事件监听器
@@ -151,20 +258,49 @@ class CircuitBreaker:
             bool: 是否成功移除
         """
         with self._lock:
-            try:
-                self._listeners.remove(listener)
-                return True
-            except ValueError:
-                pass
-                
-            try:
-                self._async_listeners.remove(listener)
-                return True
-            except ValueError:
-                pass
-                
+            for index, (_, callback) in enumerate(self._listeners):
+                if callback == listener:
+                    del self._listeners[index]
+                    return True
             return False
     
+    def _decide_and_mutate(self, now: float) -> Tuple[bool, Optional[_Transition]]:
+        """判断是否允许执行请求，并完成必要的状态转换
+        
+        同步和异步调用共用此方法，调用方需持有 self._lock。方法内部不做任何I/O，
+        因此可以在事件循环中直接调用。
+        
+        Args:
+            now: 当前单调时钟时间（time.monotonic()）
+            
+        Returns:
+            Tuple[bool, Optional[_Transition]]: (是否允许请求, 状态转换结果)
+        """
+        # 检查熔断器状态
+        if self._state is self._CLOSED:
+            return True, None
+        
+        if self._state is self._OPEN:
+            # 检查是否超过重置超时时间
+            if now > self._open_deadline and self._try_transition(self._OPEN, self._HALF_OPEN):
+                # 已转换到半开状态
+                transition = self._on_state_changed(self._HALF_OPEN, now)
+                self._half_open_trial_count = 1
+                logger.info("熔断器[%s]从OPEN转为HALF_OPEN状态，允许测试请求", self.name)
+                return True, transition
+            # 参数交给logging延迟格式化，调试日志未输出时不构造消息
+            logger.debug("熔断器[%s]拒绝请求，熔断状态，还需等待 %d 秒", self.name, self._open_deadline - now)
+            return False, None
+        
+        # 半开状态：检查是否已达到最大测试次数
+        if self._half_open_trial_count < self.half_open_max_trials:
+            self._half_open_trial_count += 1
+            logger.debug("熔断器[%s]处于HALF_OPEN状态，允许测试请求 (%d/%d)",
+                         self.name, self._half_open_trial_count, self.half_open_max_trials)
+            return True, None
+        logger.debug("熔断器[%s]拒绝额外的测试请求，已达到最大测试次数", self.name)
+        return False, None
+    
     def execute(self, action: Callable[[], Any], fallback: Optional[Callable[[], Any]] = None,
                 on_success: Optional[Callable[[Any], None]] = None,
                 on_failure: Optional[Callable[[Exception], None]] = None) -> Any:
@@ -182,33 +318,14 @@ class CircuitBreaker:
         Raises:
             Exception: 如果没有提供回退函数，且操作失败，则抛出原始异常
         """
-        allow_request = False
-        
-        with self._lock:
-            # 检查熔断器状态
-            if self._state == CircuitState.CLOSED:
-                allow_request = True
-            elif self._state == CircuitState.OPEN:
-                # 检查是否超过重置超时时间
-                if time.time() > self._last_state_change + self.reset_timeout:
-                    # 转换到半开状态
-                    self._transition_to_state(CircuitState.HALF_OPEN)
-                    allow_request = True
-                    self._half_open_trial_count = 1
-                    logger.info(f"熔断器[{self.name}]从OPEN转为HALF_OPEN状态，允许测试请求")
-                else:
-                    allow_request = False
-                    time_left = int(self._last_state_change + self.reset_timeout - time.time())
-                    logger.debug(f"熔断器[{self.name}]拒绝请求，熔断状态，还需等待 {time_left} 秒")
-            elif self._state == CircuitState.HALF_OPEN:
-                # 检查是否已达到最大测试次数
-                if self._half_open_trial_count < self.half_open_max_trials:
-                    allow_request = True
-                    self._half_open_trial_count += 1
-                    logger.debug(f"熔断器[{self.name}]处于HALF_OPEN状态，允许测试请求 ({self._half_open_trial_count}/{self.half_open_max_trials})")
-                else:
-                    allow_request = False
-                    logger.debug(f"熔断器[{self.name}]拒绝额外的测试请求，已达到最大测试次数")
+        # 关闭状态不需要状态转换，无锁读取状态后直接放行；其他状态才加锁判断
+        if self._state is self._CLOSED:
+            allow_request = True
+        else:
+            with self._lock:
+                allow_request, transition = self._decide_and_mutate(self._monotonic())
+            if transition:
+                self._notify_listeners(transition)
         
         if not allow_request:
             # 如果请求被拒绝且提供了回退函数，则执行回退函数
@@ -250,33 +367,15 @@ class CircuitBreaker:
         Raises:
             Exception: 如果没有提供回退函数，且操作失败，则抛出原始异常
         """
-        allow_request = False
-        
-        async with self._async_lock:
-            # 检查熔断器状态
-            if self._state == CircuitState.CLOSED:
-                allow_request = True
-            elif self._state == CircuitState.OPEN:
-                # 检查是否超过重置超时时间
-                if time.time() > self._last_state_change + self.reset_timeout:
-                    # 转换到半开状态
-                    await self._transition_to_state_async(CircuitState.HALF_OPEN)
-                    allow_request = True
-                    self._half_open_trial_count = 1
-                    logger.info(f"熔断器[{self.name}]从OPEN转为HALF_OPEN状态，允许测试请求")
-                else:
-                    allow_request = False
-                    time_left = int(self._last_state_change + self.reset_timeout - time.time())
-                    logger.debug(f"熔断器[{self.name}]拒绝请求，熔断状态，还需等待 {time_left} 秒")
-            elif self._state == CircuitState.HALF_OPEN:
-                # 检查是否已达到最大测试次数
-                if self._half_open_trial_count < self.half_open_max_trials:
-                    allow_request = True
-                    self._half_open_trial_count += 1
-                    logger.debug(f"熔断器[{self.name}]处于HALF_OPEN状态，允许测试请求 ({self._half_open_trial_count}/{self.half_open_max_trials})")
-                else:
-                    allow_request = False
-                    logger.debug(f"熔断器[{self.name}]拒绝额外的测试请求，已达到最大测试次数")
+        # 关闭状态不需要状态转换，无锁读取状态后直接放行；其他状态才加锁判断
+        if self._state is self._CLOSED:
+            allow_request = True
+        else:
+            # 状态判断不会挂起，直接使用线程锁即可
+            with self._lock:
+                allow_request, transition = self._decide_and_mutate(self._monotonic())
+            if transition:
+                await self._notify_listeners_async(transition)
         
         if not allow_request:
             # 如果请求被拒绝且提供了回退函数，则执行回退函数
@@ -327,39 +426,37 @@ class CircuitBreaker:
     def reset(self) -> None:
         """重置熔断器状态为关闭"""
         with self._lock:
-            self._transition_to_state(CircuitState.CLOSED)
+            transition = self._transition_to_state(self._CLOSED)
             self._consecutive_failures = 0
-            self._results_window.clear()
+            self._clear_window()
             self._last_failure_reason = None
             self._half_open_trial_count = 0
-            logger.info(f"熔断器[{self.name}]已手动重置为CLOSED状态")
+            self._stats_cache = None
+            logger.info("熔断器[%s]已手动重置为CLOSED状态", self.name)
+        if transition:
+            self._notify_listeners(transition)
     
     async def reset_async(self) -> None:
         """重置熔断器状态为关闭（异步版本）"""
-        async with self._async_lock:
-            await self._transition_to_state_async(CircuitState.CLOSED)
+        with self._lock:
+            transition = self._transition_to_state(self._CLOSED)
             self._consecutive_failures = 0
-            self._results_window.clear()
+            self._clear_window()
             self._last_failure_reason = None
             self._half_open_trial_count = 0
-            logger.info(f"熔断器[{self.name}]已手动重置为CLOSED状态")
+            self._stats_cache = None
+            logger.info("熔断器[%s]已手动重置为CLOSED状态", self.name)
+        if transition:
+            await self._notify_listeners_async(transition)
     
     def _on_success(self) -> None:
         """处理操作成功"""
+        if self._closed_success_fast_path():
+            return
         with self._lock:
-            # 更新状态
-            self._consecutive_failures = 0
-            
-            # 更新窗口结果
-            if self.failure_type in [FailureType.PERCENTAGE, FailureType.TOTAL]:
-                self._results_window.append(True)
-                if len(self._results_window) > self.window_size:
-                    self._results_window.pop(0)
-            
-            # 如果当前是半开状态，则转换回关闭状态
-            if self._state == CircuitState.HALF_OPEN:
-                self._transition_to_state(CircuitState.CLOSED)
-                logger.info(f"熔断器[{self.name}]从HALF_OPEN恢复到CLOSED状态")
+            transition = self._on_success_impl()
+        if transition:
+            self._notify_listeners(transition)
     
     def _on_failure(self, reason: str) -> None:
         """处理操作失败
@@ -368,72 +465,18 @@ class CircuitBreaker:
             reason: 失败原因
         """
         with self._lock:
-            # 更新失败原因
-            self._last_failure_reason = reason
-            
-            # 更新窗口结果
-            if self.failure_type in [FailureType.PERCENTAGE, FailureType.TOTAL]:
-                self._results_window.append(False)
-                if len(self._results_window) > self.window_size:
-                    self._results_window.pop(0)
-            
-            # 对于连续失败模式，增加计数
-            if self.failure_type == FailureType.CONSECUTIVE:
-                self._consecutive_failures += 1
-                
-                # 检查是否达到熔断阈值
-                if (self._state == CircuitState.CLOSED and 
-                    self._consecutive_failures >= self.failure_threshold):
-                    self._transition_to_state(CircuitState.OPEN)
-                    logger.warning(f"熔断器[{self.name}]从CLOSED转为OPEN状态，连续失败{self._consecutive_failures}次，原因: {reason}")
-            
-            # 对于失败百分比模式
-            elif self.failure_type == FailureType.PERCENTAGE and len(self._results_window) > 0:
-                failure_count = self._results_window.count(False)
-                failure_rate = failure_count / len(self._results_window)
-                
-                # 检查是否达到熔断阈值
-                if (self._state == CircuitState.CLOSED and 
-                    len(self._results_window) >= min(self.window_size, 3) and 
-                    failure_rate >= self.failure_rate_threshold):
-                    self._transition_to_state(CircuitState.OPEN)
-                    logger.warning(
-                        f"熔断器[{self.name}]从CLOSED转为OPEN状态，失败率{failure_rate:.1%}超过阈值{self.failure_rate_threshold:.1%}，"
-                        f"窗口大小: {len(self._results_window)}，失败数: {failure_count}，原因: {reason}"
-                    )
-            
-            # 对于总失败次数模式
-            elif self.failure_type == FailureType.TOTAL:
-                failure_count = self._results_window.count(False)
-                
-                # 检查是否达到熔断阈值
-                if (self._state == CircuitState.CLOSED and 
-                    failure_count >= self.failure_threshold):
-                    self._transition_to_state(CircuitState.OPEN)
-                    logger.warning(
-                        f"熔断器[{self.name}]从CLOSED转为OPEN状态，失败数{failure_count}超过阈值{self.failure_threshold}，"
-                        f"窗口大小: {len(self._results_window)}，原因: {reason}"
-                    )
-            
-            # 如果当前是半开状态，任何失败都会导致重新打开
-            if self._state == CircuitState.HALF_OPEN:
-                self._transition_to_state(CircuitState.OPEN)
-                logger.warning(f"熔断器[{self.name}]从HALF_OPEN转回OPEN状态，测试请求失败，原因: {reason}")
+            transition = self._on_failure_impl(reason)
+        if transition:
+            self._notify_listeners(transition)
     
     async def _on_success_async(self) -> None:
         """处理操作成功（异步版本）"""
-        async with self._async_lock:
-            # 类似于同步版本，但可以发出异步事件
-            self._consecutive_failures = 0
-            
-            if self.failure_type in [FailureType.PERCENTAGE, FailureType.TOTAL]:
-                self._results_window.append(True)
-                if len(self._results_window) > self.window_size:
-                    self._results_window.pop(0)
-            
-            if self._state == CircuitState.HALF_OPEN:
-                await self._transition_to_state_async(CircuitState.CLOSED)
-                logger.info(f"熔断器[{self.name}]从HALF_OPEN恢复到CLOSED状态")
+        if self._closed_success_fast_path():
+            return
+        with self._lock:
+            transition = self._on_success_impl()
+        if transition:
+            await self._notify_listeners_async(transition)
     
     async def _on_failure_async(self, reason: str) -> None:
         """处理操作失败（异步版本）
@@ -441,104 +484,200 @@ class CircuitBreaker:
         Args:
             reason: 失败原因
         """
-        async with self._async_lock:
-            # 类似于同步版本，但可以发出异步事件
-            self._last_failure_reason = reason
-            
-            if self.failure_type in [FailureType.PERCENTAGE, FailureType.TOTAL]:
-                self._results_window.append(False)
-                if len(self._results_window) > self.window_size:
-                    self._results_window.pop(0)
+        with self._lock:
+            transition = self._on_failure_impl(reason)
+        if transition:
+            await self._notify_listeners_async(transition)
+    
+    def _closed_success_fast_path(self) -> bool:
+        """关闭状态且不使用窗口时，成功只需清零连续失败计数，无需加锁
+        
+        单个属性赋值在GIL下是原子的，即使与状态转换并发也只会提前清零计数，
+        与加锁路径中的 _on_success_impl 行为一致。
+        
+        Returns:
+            bool: 是否已在无锁路径中处理完毕
+        """
+        if self._state is self._CLOSED and not self._window_enabled:
+            if self._consecutive_failures:
+                self._consecutive_failures = 0
+            return True
+        return False
+    
+    def _on_success_impl(self) -> Optional[_Transition]:
+        """处理操作成功的状态更新，调用方需持有 self._lock
+        
+        Returns:
+            Optional[_Transition]: 发生状态转换时的转换结果
+        """
+        # 更新状态
+        self._consecutive_failures = 0
+        
+        # 更新窗口结果
+        if self._window_enabled:
+            self._record(True)
+        
+        # 如果当前是半开状态，则转换回关闭状态
+        if self._try_transition(self._HALF_OPEN, self._CLOSED):
+            transition = self._on_state_changed(self._CLOSED)
+            logger.info("熔断器[%s]从HALF_OPEN恢复到CLOSED状态", self.name)
+            return transition
+        return None
+    
+    def _on_failure_impl(self, reason: str) -> Optional[_Transition]:
+        """处理操作失败的状态更新，调用方需持有 self._lock
+        
+        Args:
+            reason: 失败原因
             
-            if self.failure_type == FailureType.CONSECUTIVE:
-                self._consecutive_failures += 1
-                
-                if (self._state == CircuitState.CLOSED and 
-                    self._consecutive_failures >= self.failure_threshold):
-                    await self._transition_to_state_async(CircuitState.OPEN)
-                    logger.warning(f"熔断器[{self.name}]从CLOSED转为OPEN状态，连续失败{self._consecutive_failures}次，原因: {reason}")
+        Returns:
+            Optional[_Transition]: 发生状态转换时的转换结果
+        """
+        # 更新失败原因
+        self._last_failure_reason = reason
+        
+        # 更新窗口结果
+        if self._window_enabled:
+            self._record(False)
+        
+        # 按失败类型检查是否达到熔断阈值
+        transition = self._check_trip(reason)
+        if transition:
+            return transition
+        
+        # 如果当前是半开状态，任何失败都会导致重新打开
+        if self._try_transition(self._HALF_OPEN, self._OPEN):
+            transition = self._on_state_changed(self._OPEN)
+            logger.warning("熔断器[%s]从HALF_OPEN转回OPEN状态，测试请求失败，原因: %s", self.name, reason)
+            return transition
+        return None
+    
+    def _check_trip_consecutive(self, reason: str) -> Optional[_Transition]:
+        """连续失败模式：增加连续失败计数并检查是否达到熔断阈值
+        
+        Args:
+            reason: 失败原因
             
-            elif self.failure_type == FailureType.PERCENTAGE and len(self._results_window) > 0:
-                failure_count = self._results_window.count(False)
-                failure_rate = failure_count / len(self._results_window)
-                
-                if (self._state == CircuitState.CLOSED and 
-                    len(self._results_window) >= min(self.window_size, 3) and 
-                    failure_rate >= self.failure_rate_threshold):
-                    await self._transition_to_state_async(CircuitState.OPEN)
-                    logger.warning(
-                        f"熔断器[{self.name}]从CLOSED转为OPEN状态，失败率{failure_rate:.1%}超过阈值{self.failure_rate_threshold:.1%}，"
-                        f"窗口大小: {len(self._results_window)}，失败数: {failure_count}，原因: {reason}"
-                    )
+        Returns:
+            Optional[_Transition]: 触发熔断时的转换结果
+        """
+        self._consecutive_failures += 1
+        
+        if (self._consecutive_failures >= self.failure_threshold and
+            self._try_transition(self._CLOSED, self._OPEN)):
+            transition = self._on_state_changed(self._OPEN)
+            logger.warning("熔断器[%s]从CLOSED转为OPEN状态，连续失败%d次，原因: %s",
+                           self.name, self._consecutive_failures, reason)
+            return transition
+        return None
+    
+    def _check_trip_percentage(self, reason: str) -> Optional[_Transition]:
+        """失败百分比模式：检查窗口内的失败率是否达到熔断阈值
+        
+        Args:
+            reason: 失败原因
             
-            elif self.failure_type == FailureType.TOTAL:
-                failure_count = self._results_window.count(False)
-                
-                if (self._state == CircuitState.CLOSED and 
-                    failure_count >= self.failure_threshold):
-                    await self._transition_to_state_async(CircuitState.OPEN)
-                    logger.warning(
-                        f"熔断器[{self.name}]从CLOSED转为OPEN状态，失败数{failure_count}超过阈值{self.failure_threshold}，"
-                        f"窗口大小: {len(self._results_window)}，原因: {reason}"
-                    )
+        Returns:
+            Optional[_Transition]: 触发熔断时的转换结果
+        """
+        window_len = self._window_len
+        failure_count = self._window_failures
+        
+        # failure_count / window_len >= rate_num / rate_den 的整数形式
+        if (window_len and
+            window_len >= self._min_samples_for_percentage and 
+            failure_count * self._rate_den >= self._rate_num * window_len and
+            self._try_transition(self._CLOSED, self._OPEN)):
+            transition = self._on_state_changed(self._OPEN)
+            logger.warning(
+                "熔断器[%s]从CLOSED转为OPEN状态，失败率%.1f%%超过阈值%.1f%%，窗口大小: %d，失败数: %d，原因: %s",
+                self.name, failure_count / window_len * 100, self.failure_rate_threshold * 100,
+                window_len, failure_count, reason
+            )
+            return transition
+        return None
+    
+    def _check_trip_total(self, reason: str) -> Optional[_Transition]:
+        """总失败次数模式：检查窗口内的失败数是否达到熔断阈值
+        
+        Args:
+            reason: 失败原因
             
-            if self._state == CircuitState.HALF_OPEN:
-                await self._transition_to_state_async(CircuitState.OPEN)
-                logger.warning(f"熔断器[{self.name}]从HALF_OPEN转回OPEN状态，测试请求失败，原因: {reason}")
+        Returns:
+            Optional[_Transition]: 触发熔断时的转换结果
+        """
+        failure_count = self._window_failures
+        
+        if (failure_count >= self.failure_threshold and
+            self._try_transition(self._CLOSED, self._OPEN)):
+            transition = self._on_state_changed(self._OPEN)
+            logger.warning(
+                "熔断器[%s]从CLOSED转为OPEN状态，失败数%d超过阈值%d，窗口大小: %d，原因: %s",
+                self.name, failure_count, self.failure_threshold, self._window_len, reason
+            )
+            return transition
+        return None
     
-    def _transition_to_state(self, new_state: CircuitState) -> None:
-        """转换熔断器状态并发出事件
+    def _try_transition(self, expected: CircuitState, new_state: CircuitState) -> bool:
+        """仅当当前状态为 expected 时切换到 new_state，调用方需持有 self._lock
+        
+        所有自动状态转换都经过这里，只允许 _ALLOWED_TRANSITIONS 中列出的转换。
         
         Args:
+            expected: 期望的当前状态
             new_state: 新状态
+            
+        Returns:
+            bool: 是否完成了转换
         """
-        old_state = self._state
+        if self._state is not expected:
+            return False
+        assert (expected, new_state) in self._ALLOWED_TRANSITIONS, f"非法的熔断器状态转换: {expected.name} -> {new_state.name}"
         self._state = new_state
-        self._last_state_change = time.time()
-        
-        # 创建事件对象
-        failure_count = self._consecutive_failures
-        failure_percentage = None
-        
-        if self.failure_type == FailureType.PERCENTAGE and self._results_window:
-            failure_count = self._results_window.count(False)
-            failure_percentage = failure_count / len(self._results_window)
-        elif self.failure_type == FailureType.TOTAL and self._results_window:
-            failure_count = self._results_window.count(False)
-        
-        event = CircuitBreakerEvent(
-            state=new_state,
-            failure_count=failure_count,
-            reason=self._last_failure_reason,
-            failure_percentage=failure_percentage
-        )
-        
-        # 发送事件给所有监听器
-        for listener in self._listeners:
-            try:
-                listener(event)
-            except Exception as e:
-                logger.error(f"熔断器事件监听器异常: {str(e)}")
+        return True
     
-    async def _transition_to_state_async(self, new_state: CircuitState) -> None:
-        """转换熔断器状态并发出异步事件
+    def _transition_to_state(self, new_state: CircuitState) -> Optional[_Transition]:
+        """无条件转换熔断器状态（用于手动重置），调用方需持有 self._lock
         
         Args:
             new_state: 新状态
+            
+        Returns:
+            Optional[_Transition]: (事件, 监听器快照)，没有监听器时为None
         """
-        old_state = self._state
         self._state = new_state
-        self._last_state_change = time.time()
+        return self._on_state_changed(new_state)
+    
+    def _on_state_changed(self, new_state: CircuitState, now: Optional[float] = None) -> Optional[_Transition]:
+        """状态写入后更新时间戳并生成事件，调用方需持有 self._lock
+        
+        监听器不在此处调用，而是返回事件和监听器快照，由调用方在释放锁之后分发，
+        避免慢速监听器拉长临界区。
+        
+        Args:
+            new_state: 新状态
+            now: 当前单调时钟时间，为None时读取当前时间
+            
+        Returns:
+            Optional[_Transition]: (事件, 监听器快照)，没有监听器时为None
+        """
+        self._last_state_change = self._monotonic() if now is None else now
+        if new_state is self._OPEN:
+            self._open_deadline = self._last_state_change + self.reset_timeout
+        
+        # 没有监听器时无需构造事件
+        if not self._listeners:
+            return None
         
         # 创建事件对象
         failure_count = self._consecutive_failures
         failure_percentage = None
         
-        if self.failure_type == FailureType.PERCENTAGE and self._results_window:
-            failure_count = self._results_window.count(False)
-            failure_percentage = failure_count / len(self._results_window)
-        elif self.failure_type == FailureType.TOTAL and self._results_window:
-            failure_count = self._results_window.count(False)
+        if self.failure_type is FailureType.PERCENTAGE and self._window_len:
+            failure_count = self._window_failures
+            failure_percentage = failure_count / self._window_len
+        elif self.failure_type is FailureType.TOTAL and self._window_len:
+            failure_count = self._window_failures
         
         event = CircuitBreakerEvent(
             state=new_state,
@@ -547,20 +686,51 @@ class CircuitBreaker:
             failure_percentage=failure_percentage
         )
         
-        # 发送事件给所有同步监听器
-        for listener in self._listeners:
+        return event, self._listeners.copy()
+    
+    def _notify_listeners(self, transition: _Transition) -> None:
+        """在锁外把事件发送给同步监听器
+        
+        Args:
+            transition: 状态转换结果
+        """
+        event, listeners = transition
+        for is_async, listener in listeners:
+            if is_async:
+                continue
             try:
                 listener(event)
             except Exception as e:
-                logger.error(f"熔断器事件监听器异常: {str(e)}")
+                logger.error("熔断器事件监听器异常: %s", e)
+    
+    async def _notify_listeners_async(self, transition: _Transition) -> None:
+        """在锁外把事件发送给同步监听器和异步监听器，异步监听器并发执行
         
-        # 发送事件给所有异步监听器
-        for listener in self._async_listeners:
-            try:
-                await listener(event)
-            except Exception as e:
-                logger.error(f"熔断器异步事件监听器异常: {str(e)}")
-                
+        Args:
+            transition: 状态转换结果
+        """
+        self._notify_listeners(transition)
+        event, listeners = transition
+        async_listeners = [listener for is_async, listener in listeners if is_async]
+        if async_listeners:
+            await asyncio.gather(
+                *[self._call_async_listener(listener, event) for listener in async_listeners],
+                return_exceptions=True
+            )
+    
+    @staticmethod
+    async def _call_async_listener(listener: Callable, event: CircuitBreakerEvent) -> None:
+        """调用单个异步监听器，异常只记录日志，不影响其他监听器
+        
+        Args:
+            listener: 异步监听器
+            event: 熔断器事件
+        """
+        try:
+            await listener(event)
+        except Exception as e:
+            logger.error("熔断器异步事件监听器异常: %s", e)
+    
     def __str__(self) -> str:
         """返回熔断器的字符串表示"""
         return f"CircuitBreaker[{self.name}](state={self._state.name}, failures={self._consecutive_failures})"
@@ -568,33 +738,46 @@ class CircuitBreaker:
     def get_stats(self) -> Dict[str, Any]:
         """获取熔断器的统计信息
         
+        短时间内重复调用且状态未变化时返回缓存结果的副本，计数可能有最多
+        _STATS_CACHE_TTL 秒的延迟。
+        
         Returns:
             Dict[str, Any]: 统计信息字典
         """
         with self._lock:
+            now = self._monotonic()
+            if (self._stats_cache is not None and
+                self._stats_cache_state is self._state and
+                now - self._stats_cache_time < self._STATS_CACHE_TTL):
+                return self._stats_cache.copy()
+            
             stats = {
                 "name": self.name,
                 "state": self._state.name,
                 "consecutive_failures": self._consecutive_failures,
                 "failure_threshold": self.failure_threshold,
                 "failure_type": self.failure_type.name,
-                "last_state_change": self._last_state_change,
-                "time_in_current_state": int(time.time() - self._last_state_change)
+                # 对外仍然提供墙钟时间戳
+                "last_state_change": time.time() - (now - self._last_state_change),
+                "time_in_current_state": int(now - self._last_state_change)
             }
             
-            if self._state == CircuitState.OPEN:
+            if self._state is self._OPEN:
                 stats["reset_timeout"] = self.reset_timeout
-                stats["time_until_retry"] = max(0, int(self._last_state_change + self.reset_timeout - time.time()))
+                stats["time_until_retry"] = max(0, int(self._open_deadline - now))
             
-            if self.failure_type in [FailureType.PERCENTAGE, FailureType.TOTAL] and self._results_window:
-                success_count = self._results_window.count(True)
-                failure_count = self._results_window.count(False)
-                stats["window_size"] = len(self._results_window)
+            if self._window_enabled and self._window_len:
+                failure_count = self._window_failures
+                success_count = self._window_len - failure_count
+                stats["window_size"] = self._window_len
                 stats["success_count"] = success_count
                 stats["failure_count"] = failure_count
-                stats["failure_rate"] = failure_count / len(self._results_window)
+                stats["failure_rate"] = failure_count / self._window_len
             
-            return stats
+            self._stats_cache = stats
+            self._stats_cache_time = now
+            self._stats_cache_state = self._state
+            return stats.copy()
 
 
 # 提供便捷的工厂函数来创建不同类型的熔断器
@@ -1,25 +1,104 @@
 import os
 import json
 from src.utils.app_path import get_app_dir, get_config_file_path
+from src.utils.logger import get_logger
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时回退到标准库json
+    orjson = None
+
+logger = get_logger()
+
+# 读取或解析配置文件时可能出现的异常，其他异常属于程序错误，不应被吞掉
+_LOAD_ERRORS = (OSError, json.JSONDecodeError, UnicodeDecodeError)
+if orjson is not None:
+    _LOAD_ERRORS += (orjson.JSONDecodeError,)
 
 class ConfigManager:
     def __init__(self):
         self.app_dir = get_app_dir()
         self.config_file = get_config_file_path("settings.json")
-    
+        # 配置文件原始内容的缓存，以及缓存对应的文件签名 (st_mtime_ns, st_size)
+        self._cache = None
+        self._cache_signature = None
+
+    @staticmethod
+    def _dumps(settings) -> bytes:
+        """把设置序列化为UTF-8编码的JSON字节串"""
+        if orjson is not None:
+            return orjson.dumps(settings, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(settings, ensure_ascii=False, indent=2).encode('utf-8')
+
+    @staticmethod
+    def _loads(data: bytes):
+        """把JSON字节串解析为Python对象"""
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data.decode('utf-8'))
+
     def save_settings(self, settings):
-        """保存设置到配置文件"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, ensure_ascii=False, indent=4)
-    
+        """保存设置到配置文件
+
+        先完整写入同目录下的临时文件并刷盘，再原子替换目标文件，
+        避免崩溃或断电时留下写了一半的配置文件。
+        """
+        payload = self._dumps(settings)
+        # 写入前先让缓存失效，写入失败时下次加载会重新读取文件
+        self._cache = None
+        self._cache_signature = None
+        tmp = self.config_file + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.config_file)
+        except BaseException:
+            # 替换失败时清理临时文件，原配置文件保持不变
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get_file_signature(self):
+        """获取配置文件的签名，可用于判断配置文件是否被修改
+
+        Returns:
+            Optional[tuple]: (st_mtime_ns, st_size)，文件不存在时为None
+        """
+        try:
+            st = os.stat(self.config_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
     def load_settings(self):
-        """从配置文件加载设置"""
-        if not os.path.exists(self.config_file):
+        """从配置文件加载设置
+
+        文件未修改时不再读取文件，直接解析缓存的原始内容；每次调用都返回
+        新解析出的对象，调用方修改返回值不会影响缓存。
+        """
+        signature = self.get_file_signature()
+        if signature is None:
             return {}
-        
+
+        raw = self._cache if signature == self._cache_signature else None
+
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"加载配置文件失败: {e}")
-            return {} 
\ No newline at end of file
+            if raw is None:
+                with open(self.config_file, 'rb') as f:
+                    raw = f.read()
+            data = self._loads(raw)
+        except FileNotFoundError:
+            # stat之后文件被删除
+            return {}
+        except _LOAD_ERRORS as e:
+            logger.error("加载配置文件失败: %s", e)
+            return {}
+
+        # 只缓存能成功解析的内容
+        self._cache = raw
+        self._cache_signature = signature
+        return data
@@ -1,14 +1,28 @@
 import os
+import atexit
 import logging
+import queue
 import sys
+import time
 import threading
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from PyQt6.QtCore import QObject, pyqtSignal, Qt, QThread
 from PyQt6.QtWidgets import QApplication
 from typing import Optional
 from src.utils.app_path import get_app_name, get_logs_dir
 
+# 按整数日志级别预先计算的中文名称
+_LEVEL_TO_CN = {
+    logging.DEBUG: '调试',
+    logging.INFO: '信息',
+    logging.WARNING: '警告',
+    logging.ERROR: '错误',
+    logging.CRITICAL: '严重错误',
+}
+
+# UI日志的时间格式，精确到秒
+UI_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
 # 自定义日志格式化器，将日志级别翻译成中文
 class ChineseLogFormatter(logging.Formatter):
     """自定义日志格式化器，将日志级别翻译成中文"""
@@ -22,135 +36,308 @@ class ChineseLogFormatter(logging.Formatter):
         'CRITICAL': '严重错误',
     }
     
+    # 默认日志格式，使用该格式时 format 直接用f-string拼接，不经过%-格式化
+    DEFAULT_FORMAT = '[%(asctime)s] [%(levelname_cn)s] %(message)s'
+    
+    # 最近一次格式化的 (整数秒, 时间字符串)，同一秒内的日志复用该字符串；
+    # 用一个元组整体赋值，多线程下不会读到不一致的两部分
+    _time_cache = (None, '')
+    
+    def __init__(self, fmt=None, datefmt=None, *args, **kwargs):
+        super().__init__(fmt, datefmt, *args, **kwargs)
+        self._fast = self._fmt == self.DEFAULT_FORMAT
+    
+    def formatTime(self, record, datefmt=None):
+        """格式化日志时间，时间字符串按秒缓存，毫秒部分单独拼接"""
+        return self._format_created(record.created, datefmt)
+    
+    def _format_created(self, created, datefmt):
+        """按时间戳格式化时间，供 formatTime 和 format_fields 共用
+        
+        Args:
+            created: 时间戳（time.time()）
+            datefmt: 时间格式，为None时使用默认格式并拼接毫秒
+            
+        Returns:
+            str: 时间字符串
+        """
+        seconds = int(created)
+        cached_seconds, cached_str = self._time_cache
+        if seconds != cached_seconds:
+            cached_str = time.strftime(datefmt or self.default_time_format, self.converter(seconds))
+            self._time_cache = (seconds, cached_str)
+        if datefmt:
+            return cached_str
+        return self.default_msec_format % (cached_str, (created - seconds) * 1000)
+    
+    def format_fields(self, created: float, levelno: int, message: str) -> str:
+        """不经过 LogRecord，直接按 DEFAULT_FORMAT 格式化结构化日志的各个字段
+        
+        Args:
+            created: 日志记录创建时间戳
+            levelno: 整数日志级别
+            message: 已完成参数替换的日志消息
+            
+        Returns:
+            str: 格式化后的日志文本
+        """
+        level_name = _LEVEL_TO_CN.get(levelno) or logging.getLevelName(levelno)
+        return f"[{self._format_created(created, self.datefmt)}] [{level_name}] {message}"
+    
     def format(self, record):
-        # 替换记录中的levelname为中文
-        if record.levelname in self.LEVEL_MAP:
-            record.levelname = self.LEVEL_MAP[record.levelname]
-        return super().format(record)
+        # 同一个格式化器被多个处理器共用时，每条记录只格式化一次，
+        # 结果连同格式化器本身缓存在记录上
+        cached = record.__dict__.get('_cn_formatted')
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        # 中文级别名称放在单独的属性中，不修改记录的levelname，
+        # 格式串通过 %(levelname_cn)s 引用
+        record.levelname_cn = level_name = _LEVEL_TO_CN.get(record.levelno, record.levelname)
+        if self._fast:
+            text = self._format_default(record, level_name)
+        else:
+            text = super().format(record)
+        record._cn_formatted = (self, text)
+        return text
+    
+    def _format_default(self, record, level_name):
+        """按 DEFAULT_FORMAT 格式化记录，异常和堆栈的处理与 logging.Formatter.format 一致"""
+        record.message = message = record.getMessage()
+        record.asctime = asctime = self.formatTime(record, self.datefmt)
+        text = f"[{asctime}] [{level_name}] {message}"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if text[-1:] != "\n":
+                text += "\n"
+            text += record.exc_text
+        if record.stack_info:
+            if text[-1:] != "\n":
+                text += "\n"
+            text += self.formatStack(record.stack_info)
+        return text
+
+# UI日志共用的格式化器：UILogHandler 格式化整行文本和UI组件格式化结构化日志
+# 都使用它，两条路径的输出和时间缓存保持一致
+_UI_FORMATTER = ChineseLogFormatter(ChineseLogFormatter.DEFAULT_FORMAT, datefmt=UI_DATE_FORMAT)
+
+# 把结构化日志信号的参数 (created, levelno, message) 格式化为UI显示的一行文本
+format_log_line = _UI_FORMATTER.format_fields
 
 class LogSignals(QObject):
     """日志信号类，用于将日志消息发送到UI"""
+    # 结构化日志信号 (创建时间戳, 整数级别, 消息)，由槽函数按需格式化
+    log_record = pyqtSignal(float, int, str)
+    # 已格式化的日志文本，保留以兼容只接收字符串的旧槽函数
     log_message = pyqtSignal(str)
 
+class UILogHandler(logging.Handler):
+    """把日志记录通过信号发送到UI的处理器
+    
+    直接复用 logging 已经生成的 LogRecord（包括时间戳）。默认通过
+    log_record 发送结构化数据，格式化交给槽函数；只有 log_message
+    连接了槽函数时才在这里格式化整行文本。没有任何连接时什么也不做。
+    """
+    
+    def __init__(self, signals: LogSignals, level=logging.INFO):
+        """初始化处理器
+        
+        Args:
+            signals: 日志信号对象
+            level: 发送到UI的最低日志级别
+        """
+        super().__init__(level)
+        self.signals = signals
+        # 预先取出信号对象及其 emit 方法，每条日志不再重复查找属性
+        self._record_signal = signals.log_record
+        self._emit_record = self._record_signal.emit
+        self._signal = signals.log_message
+        self._emit = self._signal.emit
+    
+    def emit(self, record):
+        """把日志记录发送到UI"""
+        try:
+            receivers = self.signals.receivers
+            if receivers(self._record_signal) > 0:
+                message = record.getMessage()
+                if record.exc_info:
+                    message = f"{message}\n{self.formatter.formatException(record.exc_info)}"
+                self._emit_record(record.created, record.levelno, message)
+            if receivers(self._signal) > 0:
+                self._emit(self.format(record))
+        except Exception:
+            self.handleError(record)
+
 class Logger:
     """日志管理器单例类"""
     _instance: Optional['Logger'] = None
     _initialized = False
-    _lock = threading.RLock()  # 增加线程锁
+    _init_lock = threading.Lock()  # 只用于单例的创建
     
     @classmethod
     def instance(cls) -> 'Logger':
         """获取Logger单例实例，线程安全"""
-        with cls._lock:
+        # 双重检查：实例创建后直接返回，不再加锁
+        inst = cls._instance
+        if inst is not None:
+            return inst
+        with cls._init_lock:
             if cls._instance is None:
                 cls._instance = cls()
             return cls._instance
     
     def __init__(self):
         """初始化Logger，只在第一次调用时执行"""
-        with Logger._lock:
-            if Logger._initialized:
-                return
-            
-            self.logger = logging.getLogger(get_app_name())
-            self.logger.setLevel(logging.DEBUG)
-            # 避免日志重复输出
-            self.logger.propagate = False
-            
-            # 检查是否已有处理器
-            if not self.logger.handlers:
-                # 使用自定义格式化器，将级别翻译成中文
-                self.formatter = ChineseLogFormatter('[%(asctime)s] [%(levelname)s] %(message)s')
-                
-                # 控制台日志处理器
-                self.console_handler = logging.StreamHandler()
-                self.console_handler.setFormatter(self.formatter)
-                self.console_handler.setLevel(logging.INFO)
-                self.logger.addHandler(self.console_handler)
-            
-            # 信号对象，用于与UI交互
-            self.signals = LogSignals()
-            
-            # 文件日志处理器 - 延迟初始化
-            self.file_handler = None
+        # 只由 instance() 在 _init_lock 保护下调用，这里无需再加锁
+        if Logger._initialized:
+            return
+        
+        # 应用名称和日志目录只获取一次，日志目录在创建文件处理器时确定
+        self._app_name = get_app_name()
+        self._log_dir = None
+        
+        # 处理器全部安装后由 _sync_level 收紧为处理器的最低级别
+        self.logger = logging.getLogger(self._app_name)
+        self.logger.setLevel(logging.DEBUG)
+        # 避免日志重复输出
+        self.logger.propagate = False
+        
+        # 信号对象，用于与UI交互
+        self.signals = LogSignals()
+        
+        # 检查是否已有处理器
+        if not self.logger.handlers:
+            # 使用自定义格式化器，将级别翻译成中文
+            self.formatter = ChineseLogFormatter(ChineseLogFormatter.DEFAULT_FORMAT)
             
-            # 主线程ID，用于区分是否从其他线程调用
-            self.main_thread_id = threading.current_thread().ident
+            # 控制台日志处理器
+            self.console_handler = logging.StreamHandler()
+            self.console_handler.setFormatter(self.formatter)
+            self.console_handler.setLevel(logging.INFO)
+            self.logger.addHandler(self.console_handler)
             
-            # 标记为已初始化
-            Logger._initialized = True
+            # UI日志处理器，只发送INFO及以上级别，时间精确到秒
+            self.ui_handler = UILogHandler(self.signals, logging.INFO)
+            self.ui_handler.setFormatter(_UI_FORMATTER)
+            self.logger.addHandler(self.ui_handler)
+        
+        # 文件日志处理器，在初始化结束时创建一次，日志方法中不再检查
+        self.file_handler = None
+        self._file_handler_ready = False
+        self._file_handler_lock = threading.Lock()
+        
+        # 主线程ID，用于区分是否从其他线程调用
+        self.main_thread_id = threading.current_thread().ident
+        
+        # 标记为已初始化
+        Logger._initialized = True
+        
+        # 构造时已能获取应用名称，日志目录同样可用，直接安装文件处理器
+        self._init_file_handler()
     
     def _init_file_handler(self):
-        """初始化文件日志处理器 - 延迟加载，线程安全"""
-        with Logger._lock:
-            if self.file_handler is not None:
+        """初始化文件日志处理器 - 只创建一次，线程安全"""
+        # 双重检查：创建完成后直接返回，不再加锁
+        if self._file_handler_ready:
+            return
+        with self._file_handler_lock:
+            if self._file_handler_ready:
                 return
                 
             try:
                 # 获取日志目录
-                log_dir = get_logs_dir()
+                if self._log_dir is None:
+                    self._log_dir = get_logs_dir()
                     
-                # 每天一个日志文件
-                log_file = os.path.join(log_dir, f"{datetime.now().strftime('%Y-%m-%d')}.log")
+                log_file = os.path.join(self._log_dir, self._app_name + '.log')
                 
-                # 创建文件处理器
-                self.file_handler = RotatingFileHandler(
-                    log_file, 
-                    maxBytes=10*1024*1024,  # 10MB
-                    backupCount=5
+                # 创建文件处理器：每天午夜轮转一次，旧文件按日期加后缀，最多保留5份；
+                # delay=True 推迟到第一次写入时才打开文件
+                self.file_handler = TimedRotatingFileHandler(
+                    log_file,
+                    when='midnight',
+                    backupCount=5,
+                    delay=True,
+                    encoding='utf-8'
                 )
-                self.file_handler.setFormatter(self.formatter)
+                # 入队前 queue_handler 已生成整行文本，文件处理器原样写出
+                self.file_handler.setFormatter(logging.Formatter('%(message)s'))
                 self.file_handler.setLevel(logging.DEBUG)
-                self.logger.addHandler(self.file_handler)
+                
+                # 文件写入、刷新和轮转放到后台线程，记录日志的线程只需入队；
+                # queue_handler 与控制台共用同一个格式化器，INFO及以上的日志
+                # 直接复用控制台已格式化的文本
+                self._log_queue = queue.SimpleQueue()
+                self.queue_handler = QueueHandler(self._log_queue)
+                self.queue_handler.setFormatter(self.formatter)
+                self.queue_handler.setLevel(logging.DEBUG)
+                self._queue_listener = QueueListener(
+                    self._log_queue, self.file_handler, respect_handler_level=True
+                )
+                self._queue_listener.start()
+                # 退出时写完队列中剩余的日志
+                atexit.register(self._queue_listener.stop)
+                
+                self.logger.addHandler(self.queue_handler)
+                self._file_handler_ready = True
             except Exception as e:
-                print(f"初始化文件日志处理器失败: {str(e)}")
+                # 直接写标准错误，不经过print，也不会混入标准输出
+                sys.stderr.write("初始化文件日志处理器失败: " + repr(e) + "\n")
+            # 文件处理器安装与否都会改变实际输出的最低级别
+            self._sync_level()
     
-    def debug(self, message):
+    def _sync_level(self):
+        """把logger的级别设为各处理器级别中的最低值
+        
+        没有任何处理器接收的级别（例如文件处理器初始化失败时的DEBUG）
+        直接在logger层被过滤，is_enabled_for 和各级别方法因此能真正跳过这些日志。
+        """
+        levels = [handler.level for handler in self.logger.handlers]
+        if levels:
+            self.logger.setLevel(min(levels))
+    
+    # 各级别方法的 args 用于 %-格式化，由 logging 在确实输出时才进行格式化；
+    # 没有处理器接收的级别在包装层直接返回
+    def debug(self, message, *args):
         """记录调试级别日志"""
-        self._init_file_handler()  # 确保文件处理器已初始化
-        self.logger.debug(message)
-        self._emit_to_ui(message, logging.DEBUG)
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(message, *args)
     
-    def info(self, message):
+    def info(self, message, *args):
         """记录信息级别日志"""
-        self._init_file_handler()  # 确保文件处理器已初始化
-        self.logger.info(message)
-        self._emit_to_ui(message, logging.INFO)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info(message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """记录警告级别日志"""
-        self._init_file_handler()  # 确保文件处理器已初始化
-        self.logger.warning(message)
-        self._emit_to_ui(message, logging.WARNING)
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        self.logger.warning(message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """记录错误级别日志"""
-        self._init_file_handler()  # 确保文件处理器已初始化
-        self.logger.error(message)
-        self._emit_to_ui(message, logging.ERROR)
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        self.logger.error(message, *args)
     
-    def critical(self, message):
+    def critical(self, message, *args):
         """记录严重错误级别日志"""
-        self._init_file_handler()  # 确保文件处理器已初始化
-        self.logger.critical(message)
-        self._emit_to_ui(message, logging.CRITICAL)
+        if not self.logger.isEnabledFor(logging.CRITICAL):
+            return
+        self.logger.critical(message, *args)
         
-    def _emit_to_ui(self, message, level):
-        """向UI发送日志信号，线程安全"""
-        try:
-            # 通过信号发送到UI
-            if level >= logging.INFO:  # 只有INFO及以上级别才发送到UI
-                # 获取当前时间和对应的中文级别
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                level_name = ChineseLogFormatter.LEVEL_MAP.get(
-                    logging.getLevelName(level), logging.getLevelName(level)
-                )
-                # 格式化消息
-                formatted_msg = f"[{timestamp}] [{level_name}] {message}"
-                # 发送到UI
-                self.signals.log_message.emit(formatted_msg)
-        except Exception as e:
-            print(f"发送日志到UI失败: {str(e)}")
+    def is_enabled_for(self, level) -> bool:
+        """判断指定级别的日志是否会被某个处理器输出，可用于跳过昂贵的消息构造
+        
+        Args:
+            level: 日志级别，例如 logging.DEBUG
+            
+        Returns:
+            bool: 是否会被记录
+        """
+        return self.logger.isEnabledFor(level)
 
 
 # 便捷函数，用于快速访问日志功能
@@ -160,17 +347,17 @@ def get_logger() -> Logger:
 
 
 # 日志级别快捷函数
-def debug(message):
-    get_logger().debug(message)
+def debug(message, *args):
+    get_logger().debug(message, *args)
 
-def info(message):
-    get_logger().info(message)
+def info(message, *args):
+    get_logger().info(message, *args)
     
-def warning(message):
-    get_logger().warning(message)
+def warning(message, *args):
+    get_logger().warning(message, *args)
     
-def error(message):
-    get_logger().error(message)
+def error(message, *args):
+    get_logger().error(message, *args)
     
-def critical(message):
-    get_logger().critical(message) 
\ No newline at end of file
+def critical(message, *args):
+    get_logger().critical(message, *args) 
\ No newline at end of file
@@ -1,56 +1,68 @@
 from PyQt6.QtCore import QObject, pyqtSignal
+from contextlib import contextmanager
+import operator
 import threading
 
 # 定义进度条信号类
 class ProgressSignals(QObject):
     """进度信号类，用于在UI中更新进度条"""
     progress_update = pyqtSignal(int, int)  # 参数: current, total
+    progress_started = pyqtSignal(int)  # 参数: total
     progress_reset = pyqtSignal()
 
 # 单例模式的进度管理器
 class ProgressManager:
-    _instance = None
-    _initialized = False
-    _lock = threading.RLock()  # 添加线程锁确保并发安全
+    _lock = threading.RLock()  # 保护任务状态的修改
     
     @classmethod
     def instance(cls):
         """获取ProgressManager单例实例"""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = cls()
-            return cls._instance
+        return _ProgressManagerHolder.instance
     
     def __init__(self):
-        """初始化进度管理器，只在第一次调用时执行"""
-        if ProgressManager._initialized:
-            return
-            
+        """初始化进度管理器，请通过 instance() 获取单例"""
         self.signals = ProgressSignals()
+        # 预先绑定信号的 emit 方法，省去热路径上的多次属性查找
+        self._emit_progress = self.signals.progress_update.emit
+        self._emit_reset = self.signals.progress_reset.emit
         # 内部状态
-        self._current = 0
-        self._total = 0
+        # (current, total) 打包为一个元组，整体赋值是原子的，读取方无需加锁即可得到一致的一对值
+        self._state = (0, 0)
         self._active = False  # 是否有活动的任务
-        ProgressManager._initialized = True
+        # 信号节流：进度至少前进 _emit_threshold 才发送一次更新
+        self._emit_threshold = 1
+        self._last_emitted = 0
+        # batch() 嵌套深度，大于0时 increment 只更新计数不发送信号
+        self._batch_depth = 0
         
     def start(self, total):
         """开始一个新任务并设置总数
         Args:
-            total: 任务总数量
+            total: 任务总数量，必须是大于0的整数
+        Raises:
+            TypeError: total 不是整数
+            ValueError: total 小于等于0
         """
+        # 参数校验不涉及共享状态，放在锁外进行；
+        # operator.index 只接受真正的整数类型，不会截断浮点数或解析字符串
+        try:
+            total = operator.index(total)
+        except TypeError:
+            raise TypeError(f"任务总数必须是整数，实际类型为 {type(total).__name__}") from None
+        if total <= 0:
+            raise ValueError(f"任务总数必须大于0，实际为 {total}")
+        
         with self._lock:
-            if not isinstance(total, int) or total <= 0:
-                print("任务总数必须是大于0的整数")
-                return False
-                
-            # 重置计数器
-            self._current = 0
-            self._total = total
+            # 重置计数
+            self._state = (0, total)
             self._active = True
+            # 大约每前进1%发送一次进度信号
+            self._emit_threshold = max(1, total // 100)
+            self._last_emitted = 0
             
             # 发送初始进度信号
-            self.signals.progress_update.emit(0, total)
-            return True
+            self._emit_progress(0, total)
+            self.signals.progress_started.emit(total)
     
     def increment(self, amount=1):
         """增加当前进度计数
@@ -59,27 +71,55 @@ class ProgressManager:
         Returns:
             bool: 是否成功更新
         """
+        if amount <= 0:
+            return True
+        
+        # 计数和发布在同一个临界区内完成，进度不会回退；信号在锁外发送
         with self._lock:
             # 检查是否有活动任务
             if not self._active:
                 print("没有活动的任务，请先调用start()")
                 return False
-                
-            # 增加当前计数
-            self._current += amount
             
-            # 确保不超过总数
-            if self._current > self._total:
-                self._current = self._total
-                
-            # 发送进度更新信号
-            self.signals.progress_update.emit(self._current, self._total)
+            # 增加当前计数
+            current, total = self._state
+            current += amount
             
-            # 如果已完成，自动调用complete
-            if self._current >= self._total:
+            # 如果已完成，自动调用complete（complete会设置最终进度并发送信号）
+            if current >= total:
                 self.complete()
-                
-            return True
+                return True
+            self._state = (current, total)
+            
+            # 批量模式下或前进量不足阈值时不发送信号
+            if (self._batch_depth != 0 or
+                    current - self._last_emitted < self._emit_threshold):
+                return True
+            self._last_emitted = current
+        
+        self._emit_progress(current, total)
+        return True
+    
+    @contextmanager
+    def batch(self):
+        """批量更新进度，代码块内的 increment 不发送信号，退出时统一发送一次
+        
+        用法:
+            with progress_manager.batch():
+                for item in items:
+                    progress_manager.increment()
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._active:
+                    current, total = self._state
+                    self._last_emitted = current
+                    self._emit_progress(current, total)
     
     def complete(self):
         """标记当前任务完成（将current设为等于total）"""
@@ -88,10 +128,12 @@ class ProgressManager:
                 return False
                 
             # 设置当前计数为总数
-            self._current = self._total
+            total = self._state[1]
+            self._state = (total, total)
+            self._last_emitted = total
             
             # 发送最终进度更新
-            self.signals.progress_update.emit(self._current, self._total)
+            self._emit_progress(total, total)
             
             # 重置活动状态
             self._active = False
@@ -100,18 +142,23 @@ class ProgressManager:
     def reset(self):
         """重置进度条，取消当前任务"""
         with self._lock:
-            self._current = 0
-            self._total = 0
+            self._state = (0, 0)
             self._active = False
-            self.signals.progress_reset.emit()
+            self._emit_reset()
             
     def get_progress(self):
         """获取当前进度状态
         Returns:
             tuple: (current, total, active)
         """
-        with self._lock:
-            return self._current, self._total, self._active
+        # 只读取两个属性，不需要加锁
+        current, total = self._state
+        return current, total, self._active
+
+# 单例持有类：类体在模块导入时执行且只执行一次，导入锁保证线程安全，
+# 实例（及其中的QObject信号对象）因此创建在导入本模块的主线程中
+class _ProgressManagerHolder:
+    instance = ProgressManager()
 
 # 便捷函数，用于快速访问进度条功能
 def get_progress_manager():
@@ -120,8 +167,8 @@ def get_progress_manager():
 
 # 快捷函数
 def start_progress(total):
-    """开始一个新的进度任务"""
-    return get_progress_manager().start(total)
+    """开始一个新的进度任务，total 不是大于0的整数时抛出 TypeError/ValueError"""
+    get_progress_manager().start(total)
     
 def increment_progress(amount=1):
     """增加进度计数"""
@@ -133,4 +180,8 @@ def complete_progress():
     
 def reset_progress():
     """重置进度"""
-    return get_progress_manager().reset() 
\ No newline at end of file
+    return get_progress_manager().reset()
+
+def batch_progress():
+    """批量更新进度的上下文管理器"""
+    return get_progress_manager().batch() 
\ No newline at end of file